@@ -0,0 +1,153 @@
+"""Shared loader for data.yml used by the visualization scripts.
+The first run parses data.yml (with libyaml when available) and writes a
+columnar sidecar next to it: data.feather when pyarrow is installed,
+data.jsonl otherwise. Later runs read the sidecar while it is at least as
+new as data.yml. When the updater stores history as data.parquet or
+data.ndjson (cache_format: parquet / jsonl) and that file is newer than
+data.yml, it is read directly instead.
+"""
+import os
+from pathlib import Path
+import yaml
+import numpy as np
+import pandas as pd
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    feather = None
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+DATA_FILE = Path('data.yml')
+CACHE_FILE = DATA_FILE.with_suffix('.feather')
+JSONL_CACHE_FILE = DATA_FILE.with_suffix('.jsonl')
+PARQUET_FILE = DATA_FILE.with_suffix('.parquet')
+NDJSON_FILE = DATA_FILE.with_suffix('.ndjson')
+def _read_cache(cache_file):
+    """Read the Feather cache, or the JSON-Lines cache when pyarrow is not installed"""
+    if feather is not None:
+        return feather.read_feather(cache_file, use_threads=True, memory_map=True).set_index('timestamp')
+    df = pd.read_json(cache_file, lines=True, dtype=False)
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    return df.set_index('timestamp')
+def _write_cache(df, cache_file):
+    """Write df to the Feather cache, or to JSON Lines when pyarrow is not installed"""
+    if feather is not None:
+        df.reset_index().to_feather(cache_file)
+    else:
+        df.reset_index().to_json(cache_file, orient='records', lines=True,
+                                 date_format='iso', date_unit='us', double_precision=15)
+def _parse_columns(f, columns):
+    """Collect only the wanted keys of each data.yml record straight from the parser's event stream"""
+    wanted = set(columns) | {'timestamp'}
+    raw = {col: [] for col in wanted}
+    seen = set()
+    row = key = None
+    for event in yaml.parse(f, Loader=_Loader):
+        if isinstance(event, yaml.ScalarEvent) and row is not None:
+            if key is None:
+                key = event.value
+            else:
+                if key in wanted:
+                    row[key] = event.value
+                key = None
+        elif isinstance(event, yaml.MappingStartEvent) and row is None:
+            row = {}
+        elif isinstance(event, yaml.MappingEndEvent):
+            for col in wanted:
+                raw[col].append(row.get(col))
+            seen.update(row)
+            row = None
+        elif isinstance(event, (yaml.CollectionStartEvent, yaml.AliasEvent)) and row is not None:
+            raise ValueError(f"Unexpected nested value under {key!r} in {DATA_FILE}")
+    if 'timestamp' not in seen:
+        raise ValueError(f"No timestamp column in {DATA_FILE}")
+    index = pd.DatetimeIndex(pd.to_datetime(raw['timestamp'], format='ISO8601'), name='timestamp')
+    return pd.DataFrame({col: pd.to_numeric(np.array(raw[col], dtype=object), errors='coerce')
+                         for col in columns if col in seen}, index=index)
+def read_columns(path, columns):
+    """Stream-parse only the given columns from a records file laid out like data.yml"""
+    with open(path, 'rb') as f:
+        return _tidy(_parse_columns(f, columns))
+def _tidy(df):
+    """Sort by timestamp if needed and drop rows with no values"""
+    if not df.index.is_monotonic_increasing:
+        df = df.take(df.index.argsort(kind='stable'))
+    return df.dropna(how='all')
+def _float_column(data, col):
+    """One record key as a float64 array, with missing or null values as NaN"""
+    try:
+        return np.fromiter((np.nan if (value := record.get(col)) is None else value for record in data),
+                           dtype=np.float64, count=len(data))
+    except (TypeError, ValueError):
+        return pd.to_numeric(np.array([record.get(col) for record in data], dtype=object), errors='coerce')
+def frame_from_records(data):
+    """Build the timestamp-indexed frame from data.yml's list of records, filling one float column at a time"""
+    columns = list(dict.fromkeys(key for record in data for key in record if key != 'timestamp'))
+    index = pd.DatetimeIndex(pd.to_datetime([record['timestamp'] for record in data], format='ISO8601'),
+                             name='timestamp')
+    return _tidy(pd.DataFrame({col: _float_column(data, col) for col in columns}, index=index))
+def _read_parquet_store(path):
+    """Read the updater's Parquet record store as the timestamp-indexed float frame"""
+    df = pd.read_parquet(path)
+    index = pd.DatetimeIndex(pd.to_datetime(df.pop('timestamp'), format='ISO8601'), name='timestamp')
+    return _tidy(df.set_axis(index).astype(np.float64))
+def _read_ndjson_store(path):
+    """Read the updater's JSON Lines record store as the timestamp-indexed float frame"""
+    df = pd.read_json(path, lines=True, dtype=False, convert_dates=False)
+    index = pd.DatetimeIndex(pd.to_datetime(df.pop('timestamp'), format='ISO8601'), name='timestamp')
+    return _tidy(df.set_axis(index).astype(np.float64))
+STORE_READERS = {PARQUET_FILE: _read_parquet_store, NDJSON_FILE: _read_ndjson_store}
+def _current_store():
+    """The newest updater record store that is at least as new as data.yml, or None"""
+    stores = [path for path in STORE_READERS if path.exists()]
+    if not stores:
+        return None
+    newest = max(stores, key=lambda path: path.stat().st_mtime)
+    if DATA_FILE.exists() and newest.stat().st_mtime < DATA_FILE.stat().st_mtime:
+        return None
+    return newest
+def source_file():
+    """The file load_data reads its records from: the current updater store, or data.yml"""
+    return _current_store() or DATA_FILE
+def save_cache(df):
+    """Write the columnar sidecar for a frame just saved to data.yml, so the next load skips the YAML parse"""
+    cache_file = CACHE_FILE if feather is not None else JSONL_CACHE_FILE
+    try:
+        _write_cache(df, cache_file)
+    except OSError as e:
+        print(f"⚠️ Could not write {cache_file}: {e}")
+def load_data(rebuild_cache=False, columns=None):
+    """Load and preprocess the data from data.yml, reusing the columnar cache while it is fresh.
+    When columns is given only those series are returned, and a cold load parses only those keys.
+    """
+    store = _current_store()
+    if store is not None:
+        df = STORE_READERS[store](store)
+        return df if columns is None else _tidy(df[[col for col in columns if col in df.columns]])
+    cache_file = CACHE_FILE if feather is not None else JSONL_CACHE_FILE
+    if (not rebuild_cache and cache_file.exists()
+            and cache_file.stat().st_mtime >= DATA_FILE.stat().st_mtime):
+        df = _read_cache(cache_file)
+        return df if columns is None else _tidy(df[[col for col in columns if col in df.columns]])
+    if columns is not None and not rebuild_cache:
+        try:
+            with open(DATA_FILE, 'rb') as f:
+                return _tidy(_parse_columns(f, columns))
+        except ValueError as e:
+            print(f"⚠️ Falling back to a full parse of {DATA_FILE}: {e}")
+    with open(DATA_FILE, 'rb') as f:
+        data = yaml.load(f, Loader=_Loader)
+    df = frame_from_records(data)
+    try:
+        _write_cache(df, cache_file)
+    except OSError as e:
+        print(f"⚠️ Could not write {cache_file}: {e}")
+    return df if columns is None else _tidy(df[[col for col in columns if col in df.columns]])
+def downcast_float32(df):
+    """Downcast float64 columns to float32 unless M2_F32=0"""
+    if os.environ.get('M2_F32', '1') == '1':
+        num_cols = df.select_dtypes('float64').columns
+        df[num_cols] = df[num_cols].astype(np.float32)
+    return df
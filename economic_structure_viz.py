@@ -1,61 +1,155 @@
-import yaml
+"""Economic structure analysis: stock vs flow variables and regime transitions.
+data.yml is loaded through data_loader, which parses it with PyYAML's libyaml
+bindings when available; install them with `pip install pyyaml` against a
+system libyaml (e.g. libyaml-dev) to avoid the pure-Python fallback loader.
+"""
+import argparse
+import multiprocessing
+import os
 import pandas as pd
+import matplotlib
+INTERACTIVE = os.environ.get('M2_INTERACTIVE') == '1'
+if not INTERACTIVE:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 from datetime import datetime
 import matplotlib.dates as mdates
 from matplotlib.patches import Rectangle
+from concurrent.futures import ProcessPoolExecutor
 import warnings
+import data_loader
+from data_loader import DATA_FILE, CACHE_FILE, JSONL_CACHE_FILE
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function uncompiled"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
 warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8-whitegrid')
-def load_data():
-    """Load and preprocess the data from data.yml"""
-    with open('data.yml', 'r') as f:
-        data = yaml.safe_load(f)
-    df = pd.DataFrame(data)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df.set_index('timestamp', inplace=True)
-    df.sort_index(inplace=True)
-    df = df.dropna(how='all')
-    return df
+DPI = int(os.environ.get('M2_DPI', '150'))
+LTTB_POINTS = int(os.environ.get('M2_LTTB_POINTS', '4000'))
+POLICY_ERAS = [
+    (pd.Timestamp('2020-03-01'), pd.Timestamp('2021-12-31'), 'COVID QE Era', 'red'),
+    (pd.Timestamp('2022-01-01'), pd.Timestamp('2023-12-31'), 'Tightening Cycle', 'orange')
+]
+REGIMES = [
+    (pd.Timestamp('2020-03-01'), pd.Timestamp('2021-06-30'), 'COVID Crisis & QE', 'red'),
+    (pd.Timestamp('2021-07-01'), pd.Timestamp('2022-03-01'), 'Reopening Boom', 'green'),
+    (pd.Timestamp('2022-03-01'), pd.Timestamp('2023-12-31'), 'Inflation Fight', 'orange'),
+    (pd.Timestamp('2024-01-01'), pd.Timestamp('2025-09-06'), 'New Equilibrium', 'blue')
+]
+BTC_MILESTONES = [
+    (pd.Timestamp('2021-04-14'), 'ATH $65k'),
+    (pd.Timestamp('2021-11-10'), 'ATH $69k'),
+    (pd.Timestamp('2022-11-09'), 'FTX Collapse'),
+    (pd.Timestamp('2024-03-14'), 'ETF Launch Impact')
+]
+BTC_MILESTONE_DATES = pd.DatetimeIndex([date for date, _ in BTC_MILESTONES])
+INSIGHT_PERIODS = [
+    ("COVID/QE Era", '2020-03', '2021-06'),
+    ("Tightening Cycle", '2022-03', '2023-12'),
+    ("New Equilibrium", '2024-01', None)
+]
+def load_data(rebuild_cache=False):
+    """Load data.yml through the shared cached loader, downcasting to float32 unless M2_F32=0"""
+    return data_loader.downcast_float32(data_loader.load_data(rebuild_cache=rebuild_cache))
+def rolling_mean(series, window):
+    """Trailing moving average, using bottleneck's running-sum kernel when installed"""
+    if bn is None:
+        return series.rolling(window=window).mean()
+    values = bn.move_mean(series.to_numpy(dtype=np.float64), window=window, min_count=window)
+    return pd.Series(values, index=series.index)
+@njit(cache=True)
+def _lttb_indices(x, y, n_out):
+    """Row positions kept by Largest-Triangle-Three-Buckets downsampling"""
+    n = len(x)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        best = start
+        best_area = -1.0
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best_area = area
+                best = j
+        keep[i + 1] = best
+        a = best
+    return keep
+def downsample(series, n_out=LTTB_POINTS):
+    """Index and values of series reduced to n_out points with LTTB, for plotting only"""
+    if len(series) <= n_out or n_out < 3 or series.isna().any():
+        return series.index, series.to_numpy()
+    x = series.index.asi8.astype(np.float64)
+    y = series.to_numpy(dtype=np.float64)
+    keep = _lttb_indices(x, y, n_out)
+    return series.index[keep], y[keep]
+def clean_columns(df):
+    """Drop NaNs from every column once so plotting functions can share the result"""
+    return {col: df[col].dropna() for col in df.columns}
+def rasterize_fills(axes):
+    """Flatten artists below zorder 0 (the area fills) into one raster layer per axes"""
+    for ax in np.atleast_1d(axes).flat:
+        ax.set_rasterization_zorder(0)
+def finish_figure(fig):
+    """Show the figure when M2_INTERACTIVE=1, otherwise release its buffers"""
+    if INTERACTIVE:
+        plt.show()
+    else:
+        plt.close(fig)
 def create_monetary_policy_stack(df):
     """Create comprehensive monetary policy visualization with stacked areas"""
     fig, axes = plt.subplots(2, 1, figsize=(16, 12))
+    rasterize_fills(axes)
     fig.suptitle('Monetary Policy Architecture: Stock vs Flow Variables', fontsize=18, fontweight='bold')
     ax1 = axes[0]
     m2_norm = df['M2SL'] / 1000 if 'M2SL' in df.columns else pd.Series(index=df.index)
     walcl_norm = df['WALCL'] / 1000000 if 'WALCL' in df.columns else pd.Series(index=df.index)
     rrr_norm = df['RRPONTSYD'] / 1000 if 'RRPONTSYD' in df.columns else pd.Series(index=df.index)
     if not m2_norm.empty:
-        ax1.fill_between(m2_norm.index, 0, m2_norm.values, 
-                        alpha=0.7, color='steelblue', label='M2 Money Supply (Trillions $)')
+        ax1.fill_between(m2_norm.index, 0, m2_norm.to_numpy(copy=False), 
+                        alpha=0.7, color='steelblue', label='M2 Money Supply (Trillions $)', rasterized=True, zorder=-1)
     if not walcl_norm.empty:
-        ax1.fill_between(walcl_norm.index, 0, walcl_norm.values,
-                        alpha=0.6, color='darkgreen', label='Fed Assets (Trillions $)')
+        ax1.fill_between(walcl_norm.index, 0, walcl_norm.to_numpy(copy=False),
+                        alpha=0.6, color='darkgreen', label='Fed Assets (Trillions $)', rasterized=True, zorder=-1)
     if not rrr_norm.empty and rrr_norm.max() > 0:
         rrr_scaled = rrr_norm * 100
-        ax1.fill_between(rrr_scaled.index, 0, rrr_scaled.values,
-                        alpha=0.5, color='crimson', label='Reverse Repo Ops (×100B $)')
+        ax1.fill_between(rrr_scaled.index, 0, rrr_scaled.to_numpy(copy=False),
+                        alpha=0.5, color='crimson', label='Reverse Repo Ops (×100B $)', rasterized=True, zorder=-1)
     ax1.set_title('Monetary Policy Stock Variables\n(Cumulative Positions & Balance Sheet)', 
                   fontsize=14, fontweight='bold')
     ax1.set_ylabel('Trillions of Dollars', fontsize=12)
     ax1.legend(loc='upper left', framealpha=0.9)
     ax1.grid(True, alpha=0.3)
-    ax1.axvspan(pd.Timestamp('2020-03-01'), pd.Timestamp('2021-12-31'), 
-                alpha=0.1, color='red', label='COVID QE Era')
-    ax1.axvspan(pd.Timestamp('2022-01-01'), pd.Timestamp('2023-12-31'), 
-                alpha=0.1, color='orange', label='Tightening Cycle')
+    for start, end, name, color in POLICY_ERAS:
+        ax1.axvspan(start, end, alpha=0.1, color=color, label=name)
     ax2 = axes[1]
     if 'TNX' in df.columns:
-        ax2.plot(df.index, df['TNX'] * 100, linewidth=3, color='navy', 
+        ax2.plot(*downsample(df['TNX'] * 100), linewidth=3, color='navy', 
                 label='10Y Treasury Yield (%)', alpha=0.8)
     if 'BAMLH0A0HYM2' in df.columns:
-        ax2.plot(df.index, df['BAMLH0A0HYM2'], linewidth=2, color='red', 
+        ax2.plot(*downsample(df['BAMLH0A0HYM2']), linewidth=2, color='red', 
                 label='High Yield Spread (%)', alpha=0.8)
     if 'VIX' in df.columns:
         ax2_twin = ax2.twinx()
-        ax2_twin.plot(df.index, df['VIX'], linewidth=2, color='gray', alpha=0.6,
+        ax2_twin.plot(*downsample(df['VIX']), linewidth=2, color='gray', alpha=0.6,
                      label='VIX (Volatility)', linestyle='--')
         ax2_twin.set_ylabel('VIX Level', color='gray', fontsize=11)
         ax2_twin.tick_params(axis='y', labelcolor='gray')
@@ -66,27 +160,28 @@ def create_monetary_policy_stack(df):
     ax2.legend(loc='upper left', framealpha=0.9)
     ax2.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig('monetary_policy_architecture.png', dpi=300, bbox_inches='tight')
-    plt.show()
-def create_asset_cumulative_context(df):
+    plt.savefig('monetary_policy_architecture.png', dpi=DPI, bbox_inches='tight')
+    finish_figure(fig)
+def create_asset_cumulative_context(df, clean=None):
     """Create asset level visualizations showing cumulative wealth context"""
+    if clean is None:
+        clean = clean_columns(df)
     fig, axes = plt.subplots(2, 2, figsize=(20, 12))
+    rasterize_fills(axes)
     fig.suptitle('Asset Level Analysis: Cumulative Wealth & Store of Value', fontsize=18, fontweight='bold')
     ax1 = axes[0, 0]
-    if 'BTCUSD' in df.columns:
-        btc_data = df['BTCUSD'].dropna()
-        ax1.fill_between(btc_data.index, 0, btc_data.values, 
-                        alpha=0.6, color='orange', label='Bitcoin Price')
-        ax1.plot(btc_data.index, btc_data.values, color='darkorange', linewidth=2)
-        milestones = [
-            (pd.Timestamp('2021-04-14'), 'ATH $65k'),
-            (pd.Timestamp('2021-11-10'), 'ATH $69k'),
-            (pd.Timestamp('2022-11-09'), 'FTX Collapse'),
-            (pd.Timestamp('2024-03-14'), 'ETF Launch Impact')
-        ]
-        for date, label in milestones:
-            if date in btc_data.index:
-                ax1.annotate(label, (date, btc_data[date]), 
+    btc_data = clean.get('BTCUSD')
+    if btc_data is not None:
+        btc_idx, btc_vals = downsample(btc_data)
+        ax1.fill_between(btc_idx, 0, btc_vals, 
+                        alpha=0.6, color='orange', label='Bitcoin Price', rasterized=True, zorder=-1)
+        ax1.plot(btc_idx, btc_vals, color='darkorange', linewidth=2)
+        dates = BTC_MILESTONE_DATES.tz_localize(btc_data.index.tz)
+        in_range = (dates >= btc_data.index[0]) & (dates <= btc_data.index[-1])
+        positions = np.clip(btc_data.index.searchsorted(dates), 0, len(btc_data) - 1)
+        for pos, (_, label), keep in zip(positions, BTC_MILESTONES, in_range):
+            if keep:
+                ax1.annotate(label, (btc_data.index[pos], btc_data.iloc[pos]), 
                            xytext=(10, 20), textcoords='offset points',
                            fontsize=8, alpha=0.8)
     ax1.set_title('Bitcoin: Digital Store of Value\n(Logarithmic Growth Pattern)', fontweight='bold')
@@ -94,77 +189,77 @@ def create_asset_cumulative_context(df):
     ax1.set_yscale('log')
     ax1.grid(True, alpha=0.3)
     ax2 = axes[0, 1]
-    if 'GOLD' in df.columns:
-        gold_data = df['GOLD'].dropna()
-        ax2.fill_between(gold_data.index, 0, gold_data.values,
-                        alpha=0.6, color='gold', label='Gold Price')
-        ax2.plot(gold_data.index, gold_data.values, color='darkgoldenrod', linewidth=2)
-        gold_ma = gold_data.rolling(window=90).mean()
-        ax2.plot(gold_ma.index, gold_ma.values, color='red', linewidth=2, 
+    gold_data = clean.get('GOLD')
+    if gold_data is not None:
+        gold_idx, gold_vals = downsample(gold_data)
+        ax2.fill_between(gold_idx, 0, gold_vals,
+                        alpha=0.6, color='gold', label='Gold Price', rasterized=True, zorder=-1)
+        ax2.plot(gold_idx, gold_vals, color='darkgoldenrod', linewidth=2)
+        gold_ma = rolling_mean(gold_data, 90)
+        ax2.plot(gold_ma.index, gold_ma.to_numpy(copy=False), color='red', linewidth=2, 
                 linestyle='--', alpha=0.8, label='90-Day Trend')
     ax2.set_title('Gold: Traditional Safe Haven\n(Inflation Hedge & Crisis Asset)', fontweight='bold')  
     ax2.set_ylabel('Price (USD/oz)', fontsize=11)
     ax2.legend(framealpha=0.9)
     ax2.grid(True, alpha=0.3)
     ax3 = axes[1, 0]
-    if 'NDX' in df.columns:
-        ndx_data = df['NDX'].dropna()
-        ax3.fill_between(ndx_data.index, 0, ndx_data.values,
-                        alpha=0.5, color='cyan', label='NASDAQ 100')
-        ax3.plot(ndx_data.index, ndx_data.values, color='blue', linewidth=2)
-        peak = ndx_data.expanding().max()
-        drawdown = (ndx_data - peak) / peak * 100
+    ndx_data = clean.get('NDX')
+    if ndx_data is not None:
+        ndx_idx, ndx_vals = downsample(ndx_data)
+        ax3.fill_between(ndx_idx, 0, ndx_vals,
+                        alpha=0.5, color='cyan', label='NASDAQ 100', rasterized=True, zorder=-1)
+        ax3.plot(ndx_idx, ndx_vals, color='blue', linewidth=2)
+        vals = ndx_data.to_numpy(dtype=np.float64, copy=False)
+        peak = np.maximum.accumulate(vals)
+        drawdown = pd.Series((vals - peak) / peak * 100.0, index=ndx_data.index)
         ax3_twin = ax3.twinx()
-        ax3_twin.fill_between(drawdown.index, 0, drawdown.values, 
-                             alpha=0.3, color='red', label='Drawdown %')
+        rasterize_fills(ax3_twin)
+        ax3_twin.fill_between(drawdown.index, 0, drawdown.to_numpy(copy=False), 
+                             alpha=0.3, color='red', label='Drawdown %', rasterized=True, zorder=-1)
         ax3_twin.set_ylabel('Drawdown (%)', color='red', fontsize=10)
         ax3_twin.tick_params(axis='y', labelcolor='red')
     ax3.set_title('NASDAQ 100: Innovation Economy\n(Growth Asset with Tech Focus)', fontweight='bold')
     ax3.set_ylabel('Index Level', fontsize=11)
     ax3.grid(True, alpha=0.3)
     ax4 = axes[1, 1]  
-    if 'DXY' in df.columns:
-        dxy_data = df['DXY'].dropna()
+    dxy_data = clean.get('DXY')
+    if dxy_data is not None:
         baseline = 100
-        above = dxy_data.where(dxy_data >= baseline, baseline)
-        below = dxy_data.where(dxy_data < baseline, baseline)
-        ax4.fill_between(dxy_data.index, baseline, above.values,
-                        alpha=0.6, color='green', label='USD Strength')
-        ax4.fill_between(dxy_data.index, below.values, baseline,  
-                        alpha=0.6, color='red', label='USD Weakness')
+        vals = dxy_data.to_numpy(copy=False)
+        above = np.maximum(vals, baseline)
+        below = np.minimum(vals, baseline)
+        ax4.fill_between(dxy_data.index, baseline, above,
+                        alpha=0.6, color='green', label='USD Strength', rasterized=True, zorder=-1)
+        ax4.fill_between(dxy_data.index, below, baseline,  
+                        alpha=0.6, color='red', label='USD Weakness', rasterized=True, zorder=-1)
         ax4.axhline(y=baseline, color='black', linestyle='-', alpha=0.8, linewidth=1)
-        ax4.plot(dxy_data.index, dxy_data.values, color='darkblue', linewidth=2)
+        ax4.plot(*downsample(dxy_data), color='darkblue', linewidth=2)
     ax4.set_title('US Dollar Index: Global Reserve Currency\n(Relative Strength vs Trading Partners)', fontweight='bold')
     ax4.set_ylabel('DXY Index', fontsize=11)  
     ax4.legend(framealpha=0.9)
     ax4.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig('asset_cumulative_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('asset_cumulative_analysis.png', dpi=DPI, bbox_inches='tight')
+    finish_figure(fig)
 def create_economic_regime_analysis(df):
     """Analyze and visualize economic regime transitions"""
     fig, axes = plt.subplots(3, 1, figsize=(18, 15))
+    rasterize_fills(axes)
     fig.suptitle('Economic Regime Analysis: 2020-2025 Structural Shifts', fontsize=18, fontweight='bold')
-    regimes = [
-        ('2020-03-01', '2021-06-30', 'COVID Crisis & QE', 'red'),
-        ('2021-07-01', '2022-03-01', 'Reopening Boom', 'green'), 
-        ('2022-03-01', '2023-12-31', 'Inflation Fight', 'orange'),
-        ('2024-01-01', '2025-09-06', 'New Equilibrium', 'blue')
-    ]
     ax1 = axes[0]
     if 'M2SL' in df.columns:
-        m2_growth = df['M2SL'].pct_change(periods=252).dropna() * 100
-        ax1.plot(m2_growth.index, m2_growth.values, linewidth=3, color='steelblue',
+        m2 = df['M2SL'].to_numpy(dtype=np.float64, copy=False)
+        m2_growth = pd.Series((m2[252:] / m2[:-252] - 1.0) * 100.0, index=df.index[252:]).dropna()
+        ax1.plot(m2_growth.index, m2_growth.to_numpy(copy=False), linewidth=3, color='steelblue',
                 label='M2 Growth Rate (Annualized %)')
     if 'TNX' in df.columns:
         ax1_twin = ax1.twinx()
-        ax1_twin.plot(df.index, df['TNX'] * 100, linewidth=3, color='red', alpha=0.8,
+        ax1_twin.plot(*downsample(df['TNX'] * 100), linewidth=3, color='red', alpha=0.8,
                      label='10Y Treasury Yield (%)')
         ax1_twin.set_ylabel('Interest Rate (%)', color='red', fontsize=11)
         ax1_twin.tick_params(axis='y', labelcolor='red')
-    for start, end, name, color in regimes:
-        ax1.axvspan(pd.Timestamp(start), pd.Timestamp(end), 
-                   alpha=0.15, color=color, label=name)
+    for start, end, name, color in REGIMES:
+        ax1.axvspan(start, end, alpha=0.15, color=color, label=name)
     ax1.set_title('Monetary Policy Regime Shifts', fontsize=14, fontweight='bold')
     ax1.set_ylabel('M2 Growth Rate (%)', fontsize=11)
     ax1.legend(loc='upper left', framealpha=0.9)
@@ -172,12 +267,16 @@ def create_economic_regime_analysis(df):
     ax2 = axes[1]
     assets = ['NDX', 'BTCUSD', 'GOLD']
     colors = ['blue', 'orange', 'gold']
+    present = [asset for asset in assets if asset in df.columns]
+    sub = df[present].astype(np.float64)
+    first = sub.bfill().iloc[0].to_numpy() if present else np.empty(0)
+    norm_df = pd.DataFrame(sub.to_numpy() / first * 100.0, index=sub.index, columns=present)
     for asset, color in zip(assets, colors):
-        if asset in df.columns:
-            normalized = (df[asset] / df[asset].iloc[0] * 100).dropna()
-            ax2.fill_between(normalized.index, 100, normalized.values, 
-                           alpha=0.3, color=color)
-            ax2.plot(normalized.index, normalized.values, linewidth=2, 
+        if asset in norm_df.columns:
+            normalized = norm_df[asset].dropna()
+            ax2.fill_between(normalized.index, 100, normalized.to_numpy(copy=False), 
+                           alpha=0.3, color=color, rasterized=True, zorder=-1)
+            ax2.plot(normalized.index, normalized.to_numpy(copy=False), linewidth=2, 
                     color=color, label=f'{asset} (Normalized)')
     ax2.axhline(y=100, color='black', linestyle='-', alpha=0.5)
     ax2.set_title('Risk Asset Relative Performance\n(Normalized to Starting Point = 100)', 
@@ -188,11 +287,12 @@ def create_economic_regime_analysis(df):
     ax2.grid(True, alpha=0.3)
     ax3 = axes[2]
     if 'VIX' in df.columns and 'BAMLH0A0HYM2' in df.columns:
-        ax3.fill_between(df.index, 0, df['VIX'], alpha=0.6, color='gray', 
-                        label='VIX (Market Fear)')
-        ax3.plot(df.index, df['VIX'], color='black', linewidth=2)
+        vix_idx, vix_vals = downsample(df['VIX'])
+        ax3.fill_between(vix_idx, 0, vix_vals, alpha=0.6, color='gray', 
+                        label='VIX (Market Fear)', rasterized=True, zorder=-1)
+        ax3.plot(vix_idx, vix_vals, color='black', linewidth=2)
         ax3_twin = ax3.twinx()
-        ax3_twin.plot(df.index, df['BAMLH0A0HYM2'], color='purple', linewidth=3,
+        ax3_twin.plot(*downsample(df['BAMLH0A0HYM2']), color='purple', linewidth=3,
                      label='High Yield Spread (%)', alpha=0.8)
         ax3_twin.set_ylabel('Credit Spread (%)', color='purple', fontsize=11)
         ax3_twin.tick_params(axis='y', labelcolor='purple')
@@ -204,52 +304,61 @@ def create_economic_regime_analysis(df):
     ax3.legend(loc='upper left', framealpha=0.9)
     ax3.grid(True, alpha=0.3)
     plt.tight_layout()
-    plt.savefig('economic_regime_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
-def create_flow_stock_framework(df):
-    """Demonstrate the conceptual difference between flow and stock variables"""
-    fig, axes = plt.subplots(2, 3, figsize=(20, 12))
-    fig.suptitle('Economic Variable Classification: Stock vs Flow Analysis', fontsize=18, fontweight='bold')
-    stock_vars = [
-        ('M2SL', 'Money Supply M2\n(Stock of Money)', 'steelblue'),
-        ('WALCL', 'Fed Balance Sheet\n(Stock of Assets)', 'darkgreen'),
-        ('PCEPILFE', 'Price Level Index\n(Cumulative Inflation)', 'purple')
-    ]
-    for i, (var, title, color) in enumerate(stock_vars):
-        ax = axes[0, i]
-        if var in df.columns:
-            data = df[var].dropna()
-            ax.fill_between(data.index, 0, data.values, alpha=0.6, color=color)
-            ax.plot(data.index, data.values, color=color, linewidth=2, alpha=0.9)
-            ax.text(0.05, 0.95, 'STOCK VARIABLE\n(Cumulative Level)', 
-                   transform=ax.transAxes, fontsize=10, fontweight='bold',
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8),
-                   verticalalignment='top')
-        ax.set_title(title, fontsize=12, fontweight='bold')
-        ax.grid(True, alpha=0.3)
-    flow_vars = [
-        ('TNX', '10Y Treasury Yield\n(Flow of Returns)', 'red'),
-        ('BAMLH0A0HYM2', 'Credit Risk Premium\n(Flow of Risk)', 'orange'),
-        ('VIX', 'Implied Volatility\n(Flow of Fear)', 'gray')
-    ]
-    for i, (var, title, color) in enumerate(flow_vars):
-        ax = axes[1, i]
-        if var in df.columns:
-            data = df[var].dropna()
-            ax.plot(data.index, data.values, color=color, linewidth=3, alpha=0.8)
+    plt.savefig('economic_regime_analysis.png', dpi=DPI, bbox_inches='tight')
+    finish_figure(fig)
+STOCK_FLOW_PANELS = [
+    ('M2SL', 'Money Supply M2\n(Stock of Money)', 'steelblue', 'stock'),
+    ('WALCL', 'Fed Balance Sheet\n(Stock of Assets)', 'darkgreen', 'stock'),
+    ('PCEPILFE', 'Price Level Index\n(Cumulative Inflation)', 'purple', 'stock'),
+    ('TNX', '10Y Treasury Yield\n(Flow of Returns)', 'red', 'flow'),
+    ('BAMLH0A0HYM2', 'Credit Risk Premium\n(Flow of Risk)', 'orange', 'flow'),
+    ('VIX', 'Implied Volatility\n(Flow of Fear)', 'gray', 'flow')
+]
+def _draw_panel(ax, data, title, color, kind):
+    """Draw one stock (area) or flow (line + mean) panel of the framework grid"""
+    if data is not None:
+        idx, vals = downsample(data)
+        if kind == 'stock':
+            ax.fill_between(idx, 0, vals, alpha=0.6, color=color, rasterized=True, zorder=-1)
+            ax.plot(idx, vals, color=color, linewidth=2, alpha=0.9)
+            label = 'STOCK VARIABLE\n(Cumulative Level)'
+        else:
+            ax.plot(idx, vals, color=color, linewidth=3, alpha=0.8)
             mean_val = data.mean()
             ax.axhline(y=mean_val, color=color, linestyle='--', alpha=0.5, linewidth=2,
                       label=f'Mean: {mean_val:.2f}')
-            ax.text(0.05, 0.95, 'FLOW VARIABLE\n(Rate/Intensity)', 
-                   transform=ax.transAxes, fontsize=10, fontweight='bold',
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8),
-                   verticalalignment='top')
-        ax.set_title(title, fontsize=12, fontweight='bold')
+            label = 'FLOW VARIABLE\n(Rate/Intensity)'
+        ax.text(0.05, 0.95, label, 
+               transform=ax.transAxes, fontsize=10, fontweight='bold',
+               bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8),
+               verticalalignment='top')
+    ax.set_title(title, fontsize=12, fontweight='bold')
+    if kind == 'flow':
         ax.legend(framealpha=0.9)
-        ax.grid(True, alpha=0.3)
+    ax.grid(True, alpha=0.3)
+def create_flow_stock_framework(df, clean=None):
+    """Demonstrate the conceptual difference between flow and stock variables"""
+    if clean is None:
+        clean = clean_columns(df)
+    fig, axes = plt.subplots(2, 3, figsize=(20, 12))
+    rasterize_fills(axes)
+    fig.suptitle('Economic Variable Classification: Stock vs Flow Analysis', fontsize=18, fontweight='bold')
+    for i, (var, title, color, kind) in enumerate(STOCK_FLOW_PANELS):
+        _draw_panel(axes[i // 3, i % 3], clean.get(var), title, color, kind)
     plt.tight_layout()
-    plt.savefig('stock_flow_framework.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('stock_flow_framework.png', dpi=DPI, bbox_inches='tight')
+    finish_figure(fig)
+@njit(cache=True)
+def _period_stats(vix, btc, tnx, lo, hi):
+    """Mean VIX, Bitcoin return (%) and mean 10Y yield (%) over rows lo:hi"""
+    vix_sum = 0.0
+    tnx_sum = 0.0
+    for i in range(lo, hi):
+        vix_sum += vix[i]
+        tnx_sum += tnx[i]
+    n = hi - lo
+    btc_return = (btc[hi - 1] / btc[lo] - 1.0) * 100.0
+    return vix_sum / n, btc_return, tnx_sum / n * 100.0
 def generate_structural_insights(df):
     """Generate insights about economic structure and relationships"""
     print("\\n" + "="*90)
@@ -272,53 +381,82 @@ def generate_structural_insights(df):
             volatility = df[var].std()
             print(f"   📈 {var}: {current:.2f} current, {mean_val:.2f} avg, {volatility:.2f} std")
     print("\\n🎭 REGIME TRANSITION ANALYSIS:")
-    covid_period = df['2020-03':'2021-06']  
-    tightening_period = df['2022-03':'2023-12']
-    current_period = df['2024-01':]
-    periods = [
-        ("COVID/QE Era", covid_period),
-        ("Tightening Cycle", tightening_period), 
-        ("New Equilibrium", current_period)
-    ]
-    for name, period_df in periods:
-        if not period_df.empty:
-            print(f"\\n   {name} ({period_df.index[0].strftime('%Y-%m')} - {period_df.index[-1].strftime('%Y-%m')}):")
-            if 'VIX' in period_df.columns:
-                avg_vix = period_df['VIX'].mean()
-                print(f"   • Average VIX: {avg_vix:.1f} ({'High Stress' if avg_vix > 25 else 'Moderate' if avg_vix > 15 else 'Low Stress'})")
-            if 'BTCUSD' in period_df.columns:
-                btc_return = (period_df['BTCUSD'].iloc[-1] / period_df['BTCUSD'].iloc[0] - 1) * 100
-                print(f"   • Bitcoin Performance: {btc_return:+.0f}%")
-            if 'TNX' in period_df.columns:
-                avg_yield = period_df['TNX'].mean() * 100
-                print(f"   • Average 10Y Yield: {avg_yield:.2f}%")
+    stat_cols = ['VIX', 'BTCUSD', 'TNX']
+    arrays = None
+    if all(col in df.columns for col in stat_cols):
+        arrays = [df[col].to_numpy(dtype=np.float64) for col in stat_cols]
+        if any(np.isnan(arr).any() for arr in arrays):
+            arrays = None
+    for name, start, end in INSIGHT_PERIODS:
+        lo, hi, _ = df.index.slice_indexer(start, end).indices(len(df))
+        if hi <= lo:
+            continue
+        print(f"\\n   {name} ({df.index[lo].strftime('%Y-%m')} - {df.index[hi - 1].strftime('%Y-%m')}):")
+        if arrays is not None:
+            avg_vix, btc_return, avg_yield = _period_stats(*arrays, lo, hi)
+        else:
+            period_df = df.iloc[lo:hi]
+            avg_vix = period_df['VIX'].mean() if 'VIX' in period_df.columns else None
+            btc_return = ((period_df['BTCUSD'].iloc[-1] / period_df['BTCUSD'].iloc[0] - 1) * 100
+                          if 'BTCUSD' in period_df.columns else None)
+            avg_yield = period_df['TNX'].mean() * 100 if 'TNX' in period_df.columns else None
+        if avg_vix is not None:
+            print(f"   • Average VIX: {avg_vix:.1f} ({'High Stress' if avg_vix > 25 else 'Moderate' if avg_vix > 15 else 'Low Stress'})")
+        if btc_return is not None:
+            print(f"   • Bitcoin Performance: {btc_return:+.0f}%")
+        if avg_yield is not None:
+            print(f"   • Average 10Y Yield: {avg_yield:.2f}%")
     print("\\n🔗 STRUCTURAL RELATIONSHIPS:")
-    if all(col in df.columns for col in ['M2SL', 'WALCL']):
-        m2_fed_corr = df['M2SL'].corr(df['WALCL'])
-        print(f"   • M2 ↔ Fed Assets: {m2_fed_corr:.3f} (Monetary Policy Coordination)")
-    if all(col in df.columns for col in ['PCEPILFE', 'TNX']):
-        inflation_yield_corr = df['PCEPILFE'].corr(df['TNX']) 
-        print(f"   • Inflation ↔ Bond Yields: {inflation_yield_corr:.3f} (Fisher Effect)")
-    if all(col in df.columns for col in ['NDX', 'BTCUSD']):
-        stocks_crypto_corr = df['NDX'].corr(df['BTCUSD'])
-        print(f"   • Stocks ↔ Bitcoin: {stocks_crypto_corr:.3f} (Risk-On Correlation)")
-    if all(col in df.columns for col in ['DXY', 'GOLD']):
-        dollar_gold_corr = df['DXY'].corr(df['GOLD'])
-        print(f"   • Dollar ↔ Gold: {dollar_gold_corr:.3f} (Safe Haven Competition)")
+    corr_cols = [c for c in ['M2SL', 'WALCL', 'PCEPILFE', 'TNX', 'NDX', 'BTCUSD', 'DXY', 'GOLD'] if c in df.columns]
+    corr = df[corr_cols].corr()
+    relationships = [
+        ('M2SL', 'WALCL', 'M2 ↔ Fed Assets', 'Monetary Policy Coordination'),
+        ('PCEPILFE', 'TNX', 'Inflation ↔ Bond Yields', 'Fisher Effect'),
+        ('NDX', 'BTCUSD', 'Stocks ↔ Bitcoin', 'Risk-On Correlation'),
+        ('DXY', 'GOLD', 'Dollar ↔ Gold', 'Safe Haven Competition')
+    ]
+    for a, b, label, meaning in relationships:
+        if a in corr and b in corr:
+            print(f"   • {label}: {corr.loc[a, b]:.3f} ({meaning})")
     print("\\n" + "="*90)
+def _render(job):
+    """Run one figure builder and return its completion message"""
+    builder, args, message = job
+    builder(*args)
+    return message
 def main():
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Economic structure analysis")
+    parser.add_argument(
+        '--rebuild-cache',
+        action='store_true',
+        help=f'Re-parse {DATA_FILE} and regenerate {CACHE_FILE} ({JSONL_CACHE_FILE} without pyarrow)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help='Worker processes used to render the figures (1 renders in-process)'
+    )
+    args = parser.parse_args()
     print("🚀 Loading economic data for structural analysis...")
-    df = load_data()
+    df = load_data(rebuild_cache=args.rebuild_cache)
+    clean = clean_columns(df)
     print("\\n📊 Creating economic structure visualizations...")
-    create_monetary_policy_stack(df)
-    print("✅ Monetary policy architecture complete")
-    create_asset_cumulative_context(df) 
-    print("✅ Asset cumulative analysis complete")
-    create_economic_regime_analysis(df)
-    print("✅ Economic regime analysis complete")
-    create_flow_stock_framework(df)
-    print("✅ Stock vs flow framework complete")
+    jobs = [
+        (create_monetary_policy_stack, (df,), "✅ Monetary policy architecture complete"),
+        (create_asset_cumulative_context, (df, clean), "✅ Asset cumulative analysis complete"),
+        (create_economic_regime_analysis, (df,), "✅ Economic regime analysis complete"),
+        (create_flow_stock_framework, (df, clean), "✅ Stock vs flow framework complete")
+    ]
+    if args.jobs > 1 and not INTERACTIVE:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(jobs)),
+                                 mp_context=multiprocessing.get_context('spawn')) as ex:
+            for message in ex.map(_render, jobs):
+                print(message)
+    else:
+        for job in jobs:
+            print(_render(job))
     generate_structural_insights(df)
     print("\\n🎉 Economic structure analysis complete!")
     print("Generated files:")
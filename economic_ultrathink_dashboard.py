@@ -1,52 +1,131 @@
-import yaml
+import os
+import hashlib
 import pandas as pd
+import matplotlib
+INTERACTIVE = os.environ.get('M2_INTERACTIVE') == '1'
+if not INTERACTIVE:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 import seaborn as sns
 from datetime import datetime
 import matplotlib.dates as mdates
 from matplotlib.patches import Rectangle
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
 import warnings
+from data_loader import load_data, downcast_float32
 warnings.filterwarnings('ignore')
 plt.style.use('seaborn-v0_8-whitegrid')
 plt.rcParams['figure.facecolor'] = 'white'
-def load_data():
-    """Load and preprocess the data from data.yml"""
-    with open('data.yml', 'r') as f:
-        data = yaml.safe_load(f)
-    df = pd.DataFrame(data)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df.set_index('timestamp', inplace=True)
-    df.sort_index(inplace=True)
-    df = df.dropna(how='all')
-    return df
-def create_economic_ultrathink_dashboard(df):
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+DECIMATE_BINS = 4000
+MEMO_SIZE = 8
+_MEMO = {}
+DASHBOARD_COLUMNS = ['M2SL', 'WALCL', 'RRPONTSYD', 'PCEPILFE', 'TNX', 'BAMLH0A0HYM2',
+                     'NDX', 'BTCUSD', 'DXY', 'GOLD', 'VIX']
+REGIMES = [
+    ('2020-03-01', '2021-06-30', 'COVID/QE Era', '#FF6B6B', 'Massive Stimulus'),
+    ('2021-07-01', '2022-02-28', 'Reopening Boom', '#4ECDC4', 'Growth & Inflation'),
+    ('2022-03-01', '2023-12-31', 'Inflation Fight', '#45B7D1', 'Aggressive Tightening'),
+    ('2024-01-01', '2025-09-06', 'New Equilibrium', '#96CEB4', 'Normalization')
+]
+CORRELATION_CMAP = sns.blend_palette(['#d7191c', '#fdae61', '#ffffbf', '#abd9e9', '#2c7bb6'],
+                                    n_colors=100, as_cmap=True)
+REGIMES_NUM = [(mdates.date2num(pd.Timestamp(start)), mdates.date2num(pd.Timestamp(end)), name, color, desc)
+               for start, end, name, color, desc in REGIMES]
+def memoized(columns, values, compute):
+    """Return compute(values), reusing a recent result computed from the same columns and bytes"""
+    key = (compute.__name__, columns, values.shape, hashlib.blake2b(values.tobytes(), digest_size=16).digest())
+    if key not in _MEMO:
+        if len(_MEMO) >= MEMO_SIZE:
+            del _MEMO[next(iter(_MEMO))]
+        _MEMO[key] = compute(values)
+    return _MEMO[key]
+def normalize_to_first(prices):
+    """Rebase each column to 100 at its first valid value"""
+    base = prices[np.argmax(~np.isnan(prices), axis=0), np.arange(prices.shape[1])]
+    return prices / base * 100.0
+def correlation(values):
+    """Pairwise Pearson correlation of the columns, ignoring NaNs pairwise when present"""
+    if np.isnan(values).any():
+        return pd.DataFrame(values).corr().to_numpy()
+    return np.corrcoef(values, rowvar=False)
+def add_regime_spans(ax, regimes, alpha):
+    """Shade every regime (start/end as date numbers) on ax with one full-height PolyCollection"""
+    spans = np.array([(start, end) for start, end, *_ in regimes])
+    verts = [[(x0, 0), (x0, 1), (x1, 1), (x1, 0)] for x0, x1 in spans]
+    ax.add_collection(PolyCollection(verts, facecolors=[regime[3] for regime in regimes],
+                                     alpha=alpha, linewidths=0, transform=ax.get_xaxis_transform()),
+                      autolim=False)
+    ax.update_datalim(np.column_stack([spans.ravel(), np.zeros(spans.size)]), updatey=False)
+    ax.autoscale_view(scaley=False)
+def decimate(x, y, n_bins=DECIMATE_BINS):
+    """Min-max decimate (x, y) to at most 2 * n_bins points, keeping each bucket's extremes"""
+    n = len(y)
+    if n <= 2 * n_bins or np.isnan(y).any():
+        return x, y
+    k = -(-n // n_bins)
+    m = -(-n // k)
+    buckets = np.pad(y, (0, m * k - n), mode='edge').reshape(m, k)
+    base = np.arange(m) * k
+    keep = np.unique(np.minimum(np.r_[base + buckets.argmin(axis=1), base + buckets.argmax(axis=1)], n - 1))
+    return x[keep], y[keep]
+def fill_bands(ax, x, y, thresholds, bands):
+    """Fill under (x, y) with one PolyCollection, colouring each run by its threshold band"""
+    valid = ~np.isnan(y)
+    x = mdates.date2num(x[valid])
+    y = y[valid].astype(np.float64)
+    band = np.digitize(y, thresholds, right=True)
+    starts = np.flatnonzero(np.r_[True, band[1:] != band[:-1]])
+    ends = np.r_[starts[1:], len(y)]
+    verts = [np.column_stack([np.r_[x[s:e], x[s:e][::-1]], np.r_[y[s:e], np.zeros(e - s)]])
+             for s, e in zip(starts, ends)]
+    palette = np.array([to_rgba(*bands[b][:2]) for b in range(len(thresholds) + 1)])
+    facecolors = palette[band[starts]]
+    ax.add_collection(PolyCollection(verts, facecolors=facecolors, linewidths=0, rasterized=True))
+    for color, alpha, label in bands.values():
+        ax.fill_between([], [], color=color, alpha=alpha, label=label)
+def new_or_reused_figure(fig, figsize):
+    """Return fig resized to figsize, or a new figure when fig is None"""
+    if fig is None:
+        return plt.figure(figsize=figsize)
+    fig.set_size_inches(figsize)
+    return fig
+def finish_figure(fig):
+    """Show the figure when M2_INTERACTIVE=1, otherwise clear it for the next chart"""
+    if INTERACTIVE:
+        plt.show()
+    else:
+        fig.clf()
+def create_economic_ultrathink_dashboard(df, fig=None):
     """Create the ultimate economic analysis dashboard"""
-    fig = plt.figure(figsize=(24, 18))
+    fig = new_or_reused_figure(fig, (24, 18))
     gs = fig.add_gridspec(4, 3, height_ratios=[1, 1.2, 1, 0.3], hspace=0.35, wspace=0.25)
-    regimes = [
-        ('2020-03-01', '2021-06-30', 'COVID/QE Era', '
-        ('2021-07-01', '2022-02-28', 'Reopening Boom', '
-        ('2022-03-01', '2023-12-31', 'Inflation Fight', '
-        ('2024-01-01', '2025-09-06', 'New Equilibrium', '
-    ]
+    idx = df.index
+    series = {col: df[col].to_numpy() for col in ('TNX', 'BAMLH0A0HYM2', 'VIX') if col in df.columns}
     ax1 = fig.add_subplot(gs[0, :])
-    m2_scaled = df['M2SL'] / 1000 if 'M2SL' in df.columns else pd.Series(index=df.index)
-    walcl_scaled = df['WALCL'] / 1000000 if 'WALCL' in df.columns else pd.Series(index=df.index)
-    rrr_scaled = df['RRPONTSYD'] / 1000 if 'RRPONTSYD' in df.columns else pd.Series(index=df.index)
-    if not m2_scaled.empty:
-        ax1.fill_between(m2_scaled.index, 0, m2_scaled.values, 
-                        alpha=0.8, color='
-    if not walcl_scaled.empty:
-        ax1.fill_between(walcl_scaled.index, 0, walcl_scaled.values,
-                        alpha=0.6, color='
-    if not rrr_scaled.empty and rrr_scaled.max() > 0:
-        rrr_display = rrr_scaled * 50
-        ax1.fill_between(rrr_display.index, 0, rrr_display.values,
-                        alpha=0.5, color='
-    for start, end, name, color, desc in regimes:
-        ax1.axvspan(pd.Timestamp(start), pd.Timestamp(end), 
-                   alpha=0.15, color=color)
+    stock_config = [
+        ('M2SL', 1e-3, 0.8, '#2E86AB', 'M2 Money Supply (Trillions $)'),
+        ('WALCL', 1e-6, 0.6, '#A23B72', 'Fed Balance Sheet (Trillions $)'),
+        ('RRPONTSYD', 5e-2, 0.5, '#F18F01', 'Reverse Repo ×50 (Trillions $)')
+    ]
+    stock_config = [cfg for cfg in stock_config if cfg[0] in df.columns]
+    stocks = (df[[cfg[0] for cfg in stock_config]].to_numpy(dtype=np.float32)
+              * np.array([cfg[1] for cfg in stock_config], dtype=np.float32))
+    x = mdates.date2num(idx)
+    verts, facecolors = [], []
+    for (var, _, alpha, color, label), values in zip(stock_config, stocks.T):
+        if var != 'RRPONTSYD' or np.nanmax(values) > 0:
+            valid = ~np.isnan(values)
+            xv, yv = x[valid], values[valid].astype(np.float64)
+            verts.append(np.column_stack([np.r_[xv, xv[::-1]], np.r_[yv, np.zeros(len(yv))]]))
+            facecolors.append(to_rgba(color, alpha))
+            ax1.fill_between([], [], color=color, alpha=alpha, label=label)
+    ax1.add_collection(PolyCollection(verts, facecolors=facecolors, linewidths=0, rasterized=True))
+    ax1.xaxis_date()
+    add_regime_spans(ax1, REGIMES_NUM, alpha=0.15)
     ax1.set_title('🏛️ MONETARY POLICY ARCHITECTURE: Stock Variables (Cumulative Positions)', 
                   fontsize=16, fontweight='bold', pad=20)
     ax1.set_ylabel('Trillions of Dollars', fontsize=12, fontweight='bold')
@@ -55,25 +134,26 @@ def create_economic_ultrathink_dashboard(df):
     ax1.set_ylim(0, None)
     ax2 = fig.add_subplot(gs[1, :])
     assets_config = [
-        ('BTCUSD', 'Bitcoin (Digital Gold)', '
-        ('GOLD', 'Gold (Traditional Haven)', '
-        ('NDX', 'NASDAQ 100 (Innovation)', '
-        ('DXY', 'US Dollar Index (Reserve Currency)', '
+        ('BTCUSD', 'Bitcoin (Digital Gold)', '#F7931A', 3),
+        ('GOLD', 'Gold (Traditional Haven)', '#FFD700', 2.5),
+        ('NDX', 'NASDAQ 100 (Innovation)', '#1E90FF', 2.5),
+        ('DXY', 'US Dollar Index (Reserve Currency)', '#2E8B57', 2)
     ]
-    for asset, label, color, linewidth in assets_config:
-        if asset in df.columns:
-            normalized = (df[asset] / df[asset].iloc[0] * 100).dropna()
-            ax2.plot(normalized.index, normalized.values, 
-                    linewidth=linewidth, color=color, label=label, alpha=0.9)
-            ax2.fill_between(normalized.index, 100, normalized.values, 
-                           alpha=0.15, color=color)
-    for i, (start, end, name, color, desc) in enumerate(regimes):
-        ax2.axvspan(pd.Timestamp(start), pd.Timestamp(end), 
-                   alpha=0.1, color=color)
-        mid_date = pd.Timestamp(start) + (pd.Timestamp(end) - pd.Timestamp(start)) / 2
+    assets_config = [cfg for cfg in assets_config if cfg[0] in df.columns]
+    prices = df[[cfg[0] for cfg in assets_config]].to_numpy(dtype=np.float32)
+    normalized = memoized(tuple(cfg[0] for cfg in assets_config), prices, normalize_to_first)
+    for (asset, label, color, linewidth), values in zip(assets_config, normalized.T):
+        valid = ~np.isnan(values)
+        ax2.plot(*decimate(idx[valid], values[valid]), 
+                linewidth=linewidth, color=color, label=label, alpha=0.9, rasterized=True)
+        ax2.fill_between(idx[valid], 100, values[valid], 
+                       alpha=0.15, color=color, rasterized=True)
+    add_regime_spans(ax2, REGIMES_NUM, alpha=0.1)
+    for i, (start, end, name, color, desc) in enumerate(REGIMES_NUM):
+        mid_date = (start + end) / 2
         ax2.annotate(f'{name}\\n{desc}', xy=(mid_date, 400 + i*100), 
                     ha='center', va='center', fontsize=10, fontweight='bold',
-                    bbox=dict(boxstyle="round,pad=0.3", facecolor=color, alpha=0.8, edgecolor='white'),
+                    bbox=dict(boxstyle="square,pad=0.2", facecolor=color, alpha=0.8, edgecolor='white'),
                     rotation=0)
     ax2.axhline(y=100, color='black', linestyle='--', alpha=0.7, linewidth=1)
     ax2.set_title('💰 ASSET UNIVERSE: Cumulative Wealth Creation & Store of Value Competition', 
@@ -84,9 +164,10 @@ def create_economic_ultrathink_dashboard(df):
     ax2.grid(True, alpha=0.3)
     ax2.set_ylim(50, 2000)
     ax3a = fig.add_subplot(gs[2, 0])
-    if 'TNX' in df.columns:
-        ax3a.plot(df.index, df['TNX'] * 100, linewidth=3, color='
-        ax3a.fill_between(df.index, 0, df['TNX'] * 100, alpha=0.3, color='
+    if 'TNX' in series:
+        tnx_pct = series['TNX'] * 100
+        ax3a.plot(*decimate(idx, tnx_pct), linewidth=3, color='#DC143C', label='10Y Treasury Yield', rasterized=True)
+        ax3a.fill_between(idx, 0, tnx_pct, alpha=0.3, color='#DC143C', rasterized=True)
         ax3a.axhline(y=2, color='gray', linestyle='--', alpha=0.6, label='Neutral Rate (~2%)')
         ax3a.axhline(y=5, color='red', linestyle='--', alpha=0.6, label='Restrictive (5%+)')
     ax3a.set_title('📈 Interest Rate Environment\\n(10Y Treasury Yield)', fontweight='bold', fontsize=11)
@@ -94,31 +175,28 @@ def create_economic_ultrathink_dashboard(df):
     ax3a.legend(fontsize=9)
     ax3a.grid(True, alpha=0.3)
     ax3b = fig.add_subplot(gs[2, 1])
-    if 'BAMLH0A0HYM2' in df.columns:
-        ax3b.plot(df.index, df['BAMLH0A0HYM2'], linewidth=3, color='
-        high_risk = df['BAMLH0A0HYM2'] > 5
-        ax3b.fill_between(df.index, 0, df['BAMLH0A0HYM2'], 
-                         where=high_risk, color='red', alpha=0.4, label='High Risk (>5%)')
-        ax3b.fill_between(df.index, 0, df['BAMLH0A0HYM2'], 
-                         where=~high_risk, color='green', alpha=0.3, label='Normal Risk (<5%)')
+    if 'BAMLH0A0HYM2' in series:
+        spread = series['BAMLH0A0HYM2']
+        ax3b.plot(*decimate(idx, spread), linewidth=3, color='#E74C3C', label='High Yield Spread', rasterized=True)
+        fill_bands(ax3b, idx, spread, [5], {
+            1: ('red', 0.4, 'High Risk (>5%)'),
+            0: ('green', 0.3, 'Normal Risk (<5%)')
+        })
         ax3b.axhline(y=5, color='red', linestyle='--', alpha=0.8, label='Stress Threshold')
     ax3b.set_title('⚠️ Credit Risk Premium\\n(High Yield Spread)', fontweight='bold', fontsize=11)
     ax3b.set_ylabel('Spread (%)', fontweight='bold')
     ax3b.legend(fontsize=9)
     ax3b.grid(True, alpha=0.3)
     ax3c = fig.add_subplot(gs[2, 2])
-    if 'VIX' in df.columns:
-        vix_data = df['VIX'].dropna()
-        ax3c.plot(vix_data.index, vix_data.values, linewidth=3, color='
-        high_fear = vix_data > 30
-        moderate_fear = (vix_data > 20) & (vix_data <= 30)
-        low_fear = vix_data <= 20
-        ax3c.fill_between(vix_data.index, 0, vix_data.values, 
-                         where=high_fear, color='red', alpha=0.5, label='Panic (>30)')
-        ax3c.fill_between(vix_data.index, 0, vix_data.values, 
-                         where=moderate_fear, color='orange', alpha=0.4, label='Concern (20-30)')
-        ax3c.fill_between(vix_data.index, 0, vix_data.values, 
-                         where=low_fear, color='green', alpha=0.3, label='Complacent (<20)')
+    if 'VIX' in series:
+        vix = series['VIX']
+        valid = ~np.isnan(vix)
+        ax3c.plot(*decimate(idx[valid], vix[valid]), linewidth=3, color='#696969', label='VIX', rasterized=True)
+        fill_bands(ax3c, idx, vix, [20, 30], {
+            2: ('red', 0.5, 'Panic (>30)'),
+            1: ('orange', 0.4, 'Concern (20-30)'),
+            0: ('green', 0.3, 'Complacent (<20)')
+        })
         ax3c.axhline(y=20, color='orange', linestyle='--', alpha=0.8)
         ax3c.axhline(y=30, color='red', linestyle='--', alpha=0.8)
     ax3c.set_title('😰 Market Fear Gauge\\n(VIX Volatility Index)', fontweight='bold', fontsize=11)
@@ -144,11 +222,12 @@ def create_economic_ultrathink_dashboard(df):
     fig.suptitle('🧠 ECONOMIC ULTRATHINK DASHBOARD: 2020-2025 Structural Analysis\\n' + 
                  'Stock Variables (Areas) • Flow Variables (Lines) • Regime Transitions • Asset Evolution', 
                  fontsize=20, fontweight='bold', y=0.98)
-    plt.savefig('economic_ultrathink_dashboard.png', dpi=300, bbox_inches='tight', facecolor='white')
-    plt.show()
-def create_correlation_matrix_heatmap(df):
+    fig.savefig('economic_ultrathink_dashboard.png', dpi=300, bbox_inches='tight', facecolor='white')
+    finish_figure(fig)
+def create_correlation_matrix_heatmap(df, fig=None):
     """Create an advanced correlation matrix with economic groupings"""
-    fig, ax = plt.subplots(figsize=(12, 10))
+    fig = new_or_reused_figure(fig, (12, 10))
+    ax = fig.add_subplot()
     monetary_policy = ['M2SL', 'WALCL', 'RRPONTSYD']
     macro_indicators = ['PCEPILFE', 'TNX', 'BAMLH0A0HYM2'] 
     risk_assets = ['NDX', 'BTCUSD']
@@ -156,14 +235,20 @@ def create_correlation_matrix_heatmap(df):
     volatility = ['VIX']
     ordered_cols = monetary_policy + macro_indicators + risk_assets + safe_havens + volatility
     available_cols = [col for col in ordered_cols if col in df.columns]
-    corr_matrix = df[available_cols].corr()
-    colors = ['
-    n_bins = 100
-    cmap = sns.blend_palette(colors, n_colors=n_bins, as_cmap=True)
-    mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
-    sns.heatmap(corr_matrix, mask=mask, annot=True, cmap=cmap, center=0,
-                square=True, fmt='.2f', cbar_kws={'shrink': 0.8, 'label': 'Correlation Coefficient'},
-                ax=ax, linewidths=0.5, cbar=True)
+    values = df[available_cols].to_numpy(dtype=np.float32)
+    corr = memoized(tuple(available_cols), values, correlation)
+    mask = np.triu(np.ones_like(corr, dtype=bool))
+    k = len(available_cols)
+    im = ax.imshow(np.where(mask, np.nan, corr), cmap=CORRELATION_CMAP, vmin=-1, vmax=1,
+                   extent=(0, k, k, 0), interpolation='nearest')
+    fig.colorbar(im, ax=ax, shrink=0.8, label='Correlation Coefficient')
+    for i in range(k):
+        for j in range(i):
+            text_color = 'black' if sns.utils.relative_luminance(CORRELATION_CMAP((corr[i, j] + 1) / 2)) > .408 else 'white'
+            ax.text(j + 0.5, i + 0.5, f'{corr[i, j]:.2f}', ha='center', va='center', color=text_color)
+    ax.set_xticks(np.arange(k) + 0.5, available_cols, rotation=90)
+    ax.set_yticks(np.arange(k) + 0.5, available_cols)
+    ax.grid(False)
     group_sizes = [len(monetary_policy), len(macro_indicators), len(risk_assets), len(safe_havens), len(volatility)]
     cumsum = np.cumsum([0] + group_sizes[:-1])
     for i, pos in enumerate(cumsum[1:]):
@@ -177,20 +262,23 @@ def create_correlation_matrix_heatmap(df):
                    fontweight='bold', fontsize=11, rotation=45)
     ax.set_title('🔗 Economic Correlation Matrix: Structural Relationships\\n' + 
                  '(Organized by Economic Function)', fontsize=14, fontweight='bold', pad=30)
-    plt.tight_layout()
-    plt.savefig('economic_correlation_matrix.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    fig.savefig('economic_correlation_matrix.png', dpi=300, bbox_inches='tight')
+    finish_figure(fig)
 def main():
     """Execute the ultrathink dashboard generation"""
     print("🧠 Initiating Economic Ultrathink Analysis...")
-    df = load_data()
+    df = downcast_float32(load_data(columns=DASHBOARD_COLUMNS))
     print(f"📊 Processing {len(df)} data points across {len(df.columns)} economic variables...")
     print("🎯 Applying Stock vs Flow paradigm...")
     print("⚡ Analyzing regime transitions...")
     print("🔗 Computing structural correlations...")
-    create_economic_ultrathink_dashboard(df)
+    fig = None if INTERACTIVE else plt.figure()
+    create_economic_ultrathink_dashboard(df, fig)
     print("✅ Ultrathink dashboard generated: economic_ultrathink_dashboard.png")
-    create_correlation_matrix_heatmap(df)
+    create_correlation_matrix_heatmap(df, fig)
+    if fig is not None:
+        plt.close(fig)
     print("✅ Correlation matrix generated: economic_correlation_matrix.png")
     print("\\n🎉 ULTRATHINK COMPLETE!")
     print("Generated the most comprehensive economic analysis dashboard showing:")
@@ -4,55 +4,183 @@ This replaces the original update_data.py with a cleaner, more maintainable vers
 """
 import os
 import sys
+import json
 import argparse
+from bisect import bisect_left
 from datetime import datetime, timedelta
+from itertools import compress
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 from config import config
 from data.fetcher import data_fetcher
 from utils.logger import logger
-from analysis.economic_insights import economic_analyzer
-from visualization.components import viz_components
 import yaml
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from data_loader import DATA_FILE, frame_from_records, read_columns, save_cache
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+RECORD_DECIMALS = 6
+STORE_SUFFIXES = {'parquet': '.parquet', 'jsonl': '.ndjson'}
+_RECORDS_CACHE = {}
+def _read_parquet_records(path: str) -> list:
+    """Read records from a Parquet store, mapping missing values to None."""
+    df = pd.read_parquet(path)
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+def _read_yaml_records(path: str) -> list:
+    """Read records from a YAML store."""
+    with open(path, 'rb') as f:
+        data = yaml.load(f, Loader=Loader) or []
+    return [data] if isinstance(data, dict) else data
+def _json_line(record: dict) -> bytes:
+    """Serialize one record as a JSON Lines entry."""
+    return (orjson.dumps(record) if orjson is not None else json.dumps(record).encode('utf-8')) + b'\n'
+def _read_jsonl_records(path: str) -> list:
+    """Read records from a JSON Lines store."""
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(path, 'rb') as f:
+        return [loads(line) for line in f if line.strip()]
+def _read_edge_line(path: str, last: bool) -> dict:
+    """Parse only the first or last record of a JSON Lines store, or return None if it is empty."""
+    with open(path, 'rb') as f:
+        if not last:
+            line = f.readline()
+        else:
+            size = f.seek(0, os.SEEK_END)
+            block = 4096
+            while True:
+                start = max(0, size - block)
+                f.seek(start)
+                lines = f.read().rstrip(b'\n').split(b'\n')
+                if len(lines) > 1 or start == 0:
+                    break
+                block *= 2
+            line = lines[-1]
+    loads = orjson.loads if orjson is not None else json.loads
+    return loads(line) if line.strip() else None
+def _read_edge_record(path: str, last: bool) -> dict:
+    """Parse only the first or last record of a YAML store, or return None if that is not possible."""
+    size = os.path.getsize(path)
+    block = 4096
+    with open(path, 'rb') as f:
+        while True:
+            if last:
+                start = max(0, size - block)
+                f.seek(start)
+                chunk = f.read()
+                pos = chunk.rfind(b'\n- ')
+                complete = pos >= 0 or start == 0
+                chunk = chunk[pos + 1:]
+            else:
+                f.seek(0)
+                chunk = f.read(block)
+                pos = chunk.find(b'\n- ')
+                complete = pos >= 0 or len(chunk) == size
+                chunk = chunk[:pos + 1] if pos >= 0 else chunk
+            if complete:
+                break
+            block *= 2
+    data = yaml.load(chunk, Loader=Loader)
+    if not isinstance(data, list) or len(data) != 1 or not isinstance(data[0], dict):
+        return None
+    return data[0]
+def _sorted_utc_stamps(stamps: list) -> bool:
+    """Whether stamps are all "YYYY-MM-DDTHH:MM:SS...Z" strings in ascending order, so they sort like the times."""
+    return (all(len(stamp) >= 20 and stamp[10] == "T" and stamp[-1] == "Z" for stamp in stamps)
+            and stamps == sorted(stamps))
+RECORD_READERS = {'parquet': _read_parquet_records, 'jsonl': _read_jsonl_records}
+EDGE_READERS = {'yaml': _read_edge_record, 'jsonl': _read_edge_line}
+def _cached_records(path: str, parse) -> list:
+    """Return a copy of the records in path, re-parsing only when its mtime or size changes."""
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    if key not in _RECORDS_CACHE:
+        for stale in [k for k in _RECORDS_CACHE if k[0] == path]:
+            del _RECORDS_CACHE[stale]
+        _RECORDS_CACHE[key] = parse(path)
+    return [dict(record) for record in _RECORDS_CACHE[key]]
 class EconomicDataUpdater:
     """Refactored economic data update system."""
     def __init__(self):
         """Initialize the data updater."""
-        self.data_file = config.data_settings['cache_file']
+        self.yaml_file = config.data_settings['cache_file']
+        self.cache_format = config.data_settings.get('cache_format', 'yaml')
+        if self.cache_format in STORE_SUFFIXES:
+            self.data_file = str(Path(self.yaml_file).with_suffix(STORE_SUFFIXES[self.cache_format]))
+        else:
+            self.data_file = self.yaml_file
         self.history_days = config.data_settings['history_days']
+        self._m2_figure = None
+        self._frame = None
+    def records_frame(self, records: list) -> pd.DataFrame:
+        """Timestamp-indexed frame of records, built once per records list."""
+        if self._frame is None or self._frame[0] is not records:
+            self._frame = (records, frame_from_records(records))
+        return self._frame[1]
     def load_existing_data(self) -> list:
         """Load existing data from cache file."""
-        if os.path.exists(self.data_file):
+        if self.cache_format in RECORD_READERS and os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r') as f:
-                    data = yaml.safe_load(f) or []
-                if isinstance(data, dict):
-                    data = [data]
+                data = _cached_records(self.data_file, RECORD_READERS[self.cache_format])
                 logger.info(f"📂 Loaded {len(data)} existing records from {self.data_file}")
                 return data
             except Exception as e:
                 logger.error(f"Error loading existing data: {e}")
                 return []
+        if os.path.exists(self.yaml_file):
+            try:
+                data = _cached_records(self.yaml_file, _read_yaml_records)
+                logger.info(f"📂 Loaded {len(data)} existing records from {self.yaml_file}")
+                return data
+            except Exception as e:
+                logger.error(f"Error loading existing data: {e}")
+                return []
         logger.info(f"📂 No existing data file found at {self.data_file}")
         return []
     def save_data(self, records: list) -> None:
         """Save data to cache file."""
         try:
-            with open(self.data_file, 'w') as f:
-                yaml.safe_dump(records, f, sort_keys=False)
+            if self.cache_format == 'parquet':
+                pd.DataFrame(records).to_parquet(self.data_file, compression='zstd', index=False)
+            elif self.cache_format == 'jsonl':
+                with open(self.data_file, 'wb') as f:
+                    f.writelines(_json_line(record) for record in records)
+            else:
+                with open(self.data_file, 'w') as f:
+                    yaml.dump(records, f, Dumper=Dumper, sort_keys=False)
+                if Path(self.data_file) == DATA_FILE:
+                    save_cache(self.records_frame(records))
             logger.info(f"💾 Saved {len(records)} records to {self.data_file}")
         except Exception as e:
             logger.error(f"Error saving data: {e}")
             raise
+    def append_snapshot(self, snapshot: dict) -> None:
+        """Append one record to the YAML or JSON Lines cache file without rewriting it."""
+        if self.cache_format == 'jsonl':
+            with open(self.data_file, 'ab') as f:
+                f.write(_json_line(snapshot))
+        else:
+            with open(self.data_file, 'a') as f:
+                yaml.dump([snapshot], f, Dumper=Dumper, sort_keys=False)
+        logger.info(f"💾 Appended snapshot to {self.data_file}")
+    def trim_due(self, first_record: dict) -> bool:
+        """Whether the oldest record is more than a week past the history window."""
+        cutoff_date = pd.Timestamp(datetime.utcnow() - timedelta(days=self.history_days + 7), tz='UTC')
+        return pd.Timestamp(first_record["timestamp"]) < cutoff_date
     def trim_history(self, records: list) -> list:
-        """Trim records to maintain configured history length."""
-        cutoff_date = datetime.utcnow() - timedelta(days=self.history_days)
-        trimmed = [
-            record for record in records 
-            if datetime.fromisoformat(record["timestamp"].replace("Z", "")) >= cutoff_date
-        ]
+        """Trim records to maintain configured history length, bisecting sorted UTC stamps as strings."""
+        cutoff = datetime.utcnow() - timedelta(days=self.history_days)
+        stamps = [record["timestamp"] for record in records]
+        if _sorted_utc_stamps(stamps):
+            trimmed = records[bisect_left(stamps, cutoff.strftime("%Y-%m-%dT%H:%M:%S")):]
+        else:
+            cutoff_date = pd.Timestamp(cutoff, tz='UTC')
+            timestamps = pd.to_datetime(stamps, utc=True, format='ISO8601')
+            trimmed = list(compress(records, timestamps >= cutoff_date))
         if len(trimmed) != len(records):
             logger.info(f"🗂️ Trimmed history: {len(records)} → {len(trimmed)} records")
         return trimmed
@@ -72,45 +200,50 @@ class EconomicDataUpdater:
         if df.empty:
             logger.error("❌ Backfill failed: No data retrieved")
             return []
-        records = []
-        for idx, row in df.iterrows():
-            entry = {
-                col: (None if pd.isna(val) else float(val)) 
-                for col, val in row.items()
-            }
-            timestamp = datetime.combine(idx.date(), datetime.min.time()).isoformat() + "Z"
-            entry["timestamp"] = timestamp
-            records.append(entry)
+        values = np.round(df.to_numpy(dtype=np.float64), RECORD_DECIMALS)
+        cells = values.astype(object)
+        cells[np.isnan(values)] = None
+        cells = np.column_stack([cells, np.asarray(df.index.strftime("%Y-%m-%dT00:00:00Z"), dtype=object)])
+        keys = df.columns.tolist() + ["timestamp"]
+        records = [dict(zip(keys, row)) for row in cells.tolist()]
         records = self.trim_history(records)
         logger.info(f"🔄 Backfill complete: {len(records)} records generated")
         return records
-    def generate_visualizations(self, records: list) -> None:
-        """Generate basic visualization (M2 area chart)."""
-        if not records:
+    def generate_visualizations(self, records: list = None) -> None:
+        """Generate basic visualization (M2 area chart), reading M2SL from the cache file when records is None."""
+        if records is not None and not records:
             logger.warning("⚠️ No data available for visualization")
             return
         try:
-            df = pd.DataFrame(records)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df.set_index('timestamp', inplace=True)
+            if records is None and self.cache_format == 'yaml':
+                df = read_columns(self.data_file, ['M2SL'])
+            else:
+                df = self.records_frame(self.load_existing_data() if records is None else records)
             if 'M2SL' in df.columns:
                 m2_data = df['M2SL'].dropna()
                 if not m2_data.empty:
-                    plt.figure(figsize=(10, 6))
-                    plt.fill_between(m2_data.index, m2_data.values, 
+                    n = len(m2_data)
+                    m2_data = m2_data.iloc[np.unique(np.r_[np.arange(0, n, max(1, n // 1000)), n - 1])]
+                    if self._m2_figure is None:
+                        from matplotlib.figure import Figure
+                        self._m2_figure = Figure(figsize=(10, 6))
+                        self._m2_figure.add_subplot()
+                    fig = self._m2_figure
+                    ax = fig.axes[0]
+                    ax.clear()
+                    ax.fill_between(m2_data.index, m2_data.values, 
                                    color='steelblue', alpha=0.5)
-                    plt.plot(m2_data.index, m2_data.values, color='steelblue')
-                    plt.title(f"M2SL (last {self.history_days // 365} years)")
-                    plt.xlabel("Date")
-                    plt.ylabel("M2SL")
-                    plt.tight_layout()
-                    plt.savefig("m2_area.png")
-                    plt.close()
+                    ax.plot(m2_data.index, m2_data.values, color='steelblue')
+                    ax.set_title(f"M2SL (last {self.history_days // 365} years)")
+                    ax.set_xlabel("Date")
+                    ax.set_ylabel("M2SL")
+                    fig.tight_layout()
+                    fig.savefig("m2_area.png")
                     logger.visualization_complete("M2 Area Chart", "m2_area.png")
         except Exception as e:
             logger.error(f"Visualization generation failed: {e}")
-    def run_update(self, backfill: bool = False) -> None:
-        """Run the data update process."""
+    def run_update(self, backfill: bool = False, plot: bool = True) -> None:
+        """Run the data update process, leaving m2_area.png untouched on snapshot appends when plot is False."""
         logger.info("🚀 Starting economic data update...")
         if backfill:
             logger.info("🔄 Running full historical backfill...")
@@ -119,13 +252,33 @@ class EconomicDataUpdater:
                 logger.error("❌ Backfill failed, keeping existing data unchanged")
                 return
         else:
-            records = self.load_existing_data()
-            fallback_data = records[-1] if records else {}
-            snapshot = self.create_snapshot(fallback_data)
-            records.append(snapshot)
+            records = first_record = last_record = None
+            if self.cache_format in EDGE_READERS and os.path.exists(self.data_file):
+                read_edge = EDGE_READERS[self.cache_format]
+                first_record = read_edge(self.data_file, last=False)
+                last_record = read_edge(self.data_file, last=True)
+            if first_record is None or last_record is None:
+                records = self.load_existing_data()
+                last_record = records[-1] if records else {}
+            snapshot = self.create_snapshot(last_record)
+            if (records is None and snapshot['timestamp'] >= last_record['timestamp']
+                    and not self.trim_due(first_record)):
+                self.append_snapshot(snapshot)
+                if plot:
+                    self.generate_visualizations()
+                logger.info("✅ Data update complete!")
+                return
+            if records is None:
+                records = self.load_existing_data()
+            if records and snapshot['timestamp'] < records[-1]['timestamp']:
+                records.append(snapshot)
+                records.sort(key=lambda r: r['timestamp'])
+            else:
+                records.append(snapshot)
             records = self.trim_history(records)
         self.save_data(records)
-        self.generate_visualizations(records)
+        if plot or backfill:
+            self.generate_visualizations(records)
         logger.info("✅ Data update complete!")
 def main():
     """Main entry point."""
@@ -137,6 +290,7 @@ Examples:
   python refactored_update_data.py
   python refactored_update_data.py --backfill
   python refactored_update_data.py --verbose
+  python refactored_update_data.py --no-plot
         """
     )
     parser.add_argument(
@@ -149,13 +303,18 @@ Examples:
         action='store_true', 
         help='Enable verbose debug logging'
     )
+    parser.add_argument(
+        '--no-plot',
+        action='store_true',
+        help='Skip regenerating m2_area.png for snapshot updates (backfills always plot)'
+    )
     args = parser.parse_args()
     if args.verbose:
         import logging
         logger.logger.setLevel(logging.DEBUG)
     updater = EconomicDataUpdater()
     try:
-        updater.run_update(backfill=args.backfill)
+        updater.run_update(backfill=args.backfill, plot=not args.no_plot)
     except KeyboardInterrupt:
         logger.info("⏹️ Update interrupted by user")
         sys.exit(1)
@@ -2,11 +2,20 @@
 __version__ = "2.0.0"
 __author__ = "Economic Ultrathink System"
 __description__ = "Automated economic analysis and visualization system"
-from .config import config
+import importlib
 from .utils.logger import logger
-from .data.fetcher import data_fetcher
-from .visualization.components import viz_components
-from .analysis.economic_insights import economic_analyzer
+_SINGLETONS = {
+    'config': ('.config', 'get_config'),
+    'data_fetcher': ('.data.fetcher', 'get_fetcher'),
+    'viz_components': ('.visualization.components', 'get_viz_components'),
+    'economic_analyzer': ('.analysis.economic_insights', 'get_analyzer')
+}
+def __getattr__(name: str):
+    """Import and build the package-level singletons on first access."""
+    if name in _SINGLETONS:
+        module, factory = _SINGLETONS[name]
+        return getattr(importlib.import_module(module, __name__), factory)()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 __all__ = [
     'config',
     'logger', 
@@ -1,3 +1,8 @@
 """Analysis module."""
-from .economic_insights import EconomicAnalyzer, economic_analyzer
-__all__ = ['EconomicAnalyzer', 'economic_analyzer']
\ No newline at end of file
+from .economic_insights import EconomicAnalyzer, get_analyzer, pearson_matrix
+__all__ = ['EconomicAnalyzer', 'get_analyzer', 'pearson_matrix', 'economic_analyzer']
+def __getattr__(name: str):
+    """Resolve economic_analyzer lazily so importing the package does not build it."""
+    if name == 'economic_analyzer':
+        return get_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
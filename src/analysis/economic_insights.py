@@ -1,42 +1,107 @@
 """Economic analysis and insights generation."""
+import functools
+import os
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime, timedelta
-from ..config import config
+from ..config import get_config
 from ..utils.logger import logger
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+TIMESTAMP_COLUMN = 'timestamp'
+ANALYSIS_DTYPE = np.float32 if os.environ.get('M2_ANALYSIS_F32') == '1' else np.float64
+def _max_drawdowns_numpy(arr):
+    """Worst fall from the running peak in each column, from one np.fmax.accumulate pass."""
+    peaks = np.fmax.accumulate(arr, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdowns = (arr - peaks) / peaks
+    worst = np.where(np.isnan(drawdowns), np.inf, drawdowns).min(axis=0, initial=np.inf)
+    return np.where(np.isposinf(worst), np.nan, worst)
+if njit is not None:
+    @njit(cache=True, error_model='numpy')
+    def _max_drawdowns(arr):
+        """Worst fall from the running peak in each column, skipping NaN like expanding().max()."""
+        n_rows, n_cols = arr.shape
+        result = np.full(n_cols, np.nan)
+        for j in range(n_cols):
+            peak = np.nan
+            worst = np.nan
+            for i in range(n_rows):
+                x = arr[i, j]
+                if np.isnan(x):
+                    continue
+                if np.isnan(peak) or x > peak:
+                    peak = x
+                d = (x - peak) / peak
+                if not np.isnan(d) and (np.isnan(worst) or d < worst):
+                    worst = d
+            result[j] = worst
+        return result
+else:
+    _max_drawdowns = _max_drawdowns_numpy
+def pearson_matrix(df: pd.DataFrame) -> pd.DataFrame:
+    """Pearson correlation matrix via one GEMM, deferring to pandas' pairwise path when NaNs are present."""
+    values = df.to_numpy(dtype=np.float64)
+    if len(values) < 2 or np.isnan(values).any():
+        return df.corr()
+    centered = values - values.mean(axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', centered, centered))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        standardized = centered / norms
+    correlation = np.clip(standardized.T @ standardized, -1.0, 1.0)
+    np.fill_diagonal(correlation, np.where(norms > 0, 1.0, np.nan))
+    return pd.DataFrame(correlation, index=df.columns, columns=df.columns)
 class EconomicAnalyzer:
     """Advanced economic analysis and insights generation."""
-    def __init__(self):
+    REGIME_THRESHOLDS = {
+        'VIX': ('volatility', 1, [20, 30], ['Complacent', 'Elevated Risk', 'High Stress']),
+        'TNX': ('interest_rates', 100, [3, 5], ['Accommodative', 'Neutral', 'Restrictive']),
+        'BAMLH0A0HYM2': ('credit', 1, [4, 6], ['Benign', 'Caution', 'Stress'])
+    }
+    def __init__(self, use_polars: Optional[bool] = None):
         """Initialize economic analyzer with configuration."""
-        self.regimes = config.economic_regimes
-    def analyze_regime_transitions(self, df: pd.DataFrame) -> Dict[str, Any]:
+        self.regimes = get_config().economic_regimes
+        if use_polars is None:
+            use_polars = get_config().data_settings.get('use_polars', False)
+        self.use_polars = bool(use_polars) and pl is not None
+    def analyze_regime_transitions(self, df: pd.DataFrame, pl_df: Optional[Any] = None) -> Dict[str, Any]:
         """Analyze economic regime transitions and characteristics."""
         regime_analysis = {}
+        indicators = [indicator for indicator in get_config().get_all_indicators() if indicator in df.columns]
+        if pl_df is None:
+            windows = self._regime_windows(df, indicators)
         for regime_key, regime_data in self.regimes.items():
             start_date = pd.Timestamp(regime_data['start'])
             end_date = pd.Timestamp(regime_data['end'])
-            regime_df = df[start_date:end_date]
-            if regime_df.empty:
+            if pl_df is not None:
+                window = self._window_stats_polars(pl_df, indicators, start_date, end_date)
+            else:
+                window = windows[regime_key]
+            n_rows, counts, start_values, end_values, means, volatilities = window
+            if n_rows == 0:
                 continue
+            with np.errstate(invalid='ignore', divide='ignore'):
+                total_returns = (end_values - start_values) / start_values * 100
             regime_stats = {
                 'period': f"{start_date.strftime('%Y-%m')} to {end_date.strftime('%Y-%m')}",
-                'duration_days': len(regime_df),
+                'duration_days': n_rows,
                 'name': regime_data['name'],
                 'description': regime_data['description'],
                 'characteristics': regime_data['characteristics']
             }
-            for indicator in config.get_all_indicators():
-                if indicator in regime_df.columns:
-                    series = regime_df[indicator].dropna()
-                    if not series.empty and len(series) > 1:
-                        start_value = series.iloc[0]
-                        end_value = series.iloc[-1]
-                        if start_value != 0:
-                            total_return = ((end_value - start_value) / start_value) * 100
-                            regime_stats[f'{indicator}_return'] = total_return
-                        regime_stats[f'{indicator}_mean'] = series.mean()
-                        regime_stats[f'{indicator}_volatility'] = series.std()
+            for k, indicator in enumerate(indicators):
+                if counts[k] > 1:
+                    if start_values[k] != 0:
+                        regime_stats[f'{indicator}_return'] = total_returns[k]
+                    regime_stats[f'{indicator}_mean'] = means[k]
+                    regime_stats[f'{indicator}_volatility'] = volatilities[k]
             regime_analysis[regime_key] = regime_stats
             logger.economic_summary(
                 regime_data['name'],
@@ -49,23 +114,27 @@ class EconomicAnalyzer:
                 }
             )
         return regime_analysis
-    def calculate_correlations(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def calculate_correlations(self, df: pd.DataFrame, pl_df: Optional[Any] = None) -> Dict[str, Any]:
         """Calculate and analyze structural correlations."""
-        correlation_matrix = df.corr()
-        correlations = []
-        for i in range(len(correlation_matrix.columns)):
-            for j in range(i+1, len(correlation_matrix.columns)):
-                var1 = correlation_matrix.columns[i]
-                var2 = correlation_matrix.columns[j]
-                corr_value = correlation_matrix.iloc[i, j]
-                if not pd.isna(corr_value):
-                    correlations.append({
-                        'var1': var1,
-                        'var2': var2,
-                        'correlation': corr_value,
-                        'abs_correlation': abs(corr_value)
-                    })
-        correlations.sort(key=lambda x: x['abs_correlation'], reverse=True)
+        if pl_df is not None:
+            correlation_matrix = self._pearson_matrix_polars(pl_df, df)
+        else:
+            correlation_matrix = pearson_matrix(df)
+        columns = correlation_matrix.columns.to_numpy()
+        i, j = np.triu_indices(len(columns), k=1)
+        values = correlation_matrix.to_numpy()[i, j]
+        valid = ~np.isnan(values)
+        i, j, values = i[valid], j[valid], values[valid]
+        order = np.argsort(-np.abs(values), kind='stable')[:10]
+        correlations = [
+            {
+                'var1': var1,
+                'var2': var2,
+                'correlation': float(corr_value),
+                'abs_correlation': float(abs(corr_value))
+            }
+            for var1, var2, corr_value in zip(columns[i[order]], columns[j[order]], values[order])
+        ]
         for corr_data in correlations[:5]:
             logger.correlation_insight(
                 corr_data['var1'],
@@ -74,90 +143,57 @@ class EconomicAnalyzer:
             )
         return {
             'correlation_matrix': correlation_matrix,
-            'top_correlations': correlations[:10],
-            'structural_relationships': self._identify_structural_relationships(correlations)
+            'top_correlations': correlations,
+            'structural_relationships': self._identify_structural_relationships(correlation_matrix)
         }
-    def analyze_performance_metrics(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def analyze_performance_metrics(self, df: pd.DataFrame, pl_df: Optional[Any] = None) -> Dict[str, Any]:
         """Analyze performance metrics and trends."""
-        current_date = df.index[-1]
-        recent_30d = df.tail(30)
-        previous_30d = df.iloc[-60:-30] if len(df) >= 60 else df.iloc[:30]
+        indicators = [indicator for indicator in get_config().get_all_indicators() if indicator in df.columns]
+        if pl_df is not None:
+            arr = pl_df.select(indicators).to_numpy().astype(ANALYSIS_DTYPE)
+            summary = self._performance_stats_polars(pl_df, indicators)
+        else:
+            arr = df[indicators].to_numpy(dtype=ANALYSIS_DTYPE)
+            summary = self._performance_stats(arr)
+        current_values, start_values, recent_avgs, previous_avgs, n_returns, return_stds = summary
+        with np.errstate(invalid='ignore', divide='ignore'):
+            total_returns = np.where(start_values != 0,
+                                     (current_values - start_values) / start_values * 100, 0)
+            recent_changes = np.where(~np.isnan(recent_avgs) & ~np.isnan(previous_avgs) & (previous_avgs != 0),
+                                      (recent_avgs - previous_avgs) / previous_avgs * 100, 0)
+            volatilities = np.where(n_returns > 0, return_stds * np.sqrt(252) * 100, 0)
+            max_drawdowns = np.where(n_returns > 0, _max_drawdowns(arr) * 100, 0)
         performance_metrics = {}
-        for indicator in config.get_all_indicators():
-            if indicator in df.columns:
-                indicator_config = config.get_indicator_config(indicator)
-                current_value = df[indicator].iloc[-1]
-                start_value = df[indicator].dropna().iloc[0]
-                if start_value != 0:
-                    total_return = ((current_value - start_value) / start_value) * 100
-                else:
-                    total_return = 0
-                recent_avg = recent_30d[indicator].mean()
-                previous_avg = previous_30d[indicator].mean()
-                recent_change = 0
-                if not pd.isna(recent_avg) and not pd.isna(previous_avg) and previous_avg != 0:
-                    recent_change = ((recent_avg - previous_avg) / previous_avg) * 100
-                returns = df[indicator].pct_change().dropna()
-                if not returns.empty:
-                    volatility = returns.std() * np.sqrt(252) * 100
-                    max_drawdown = self._calculate_max_drawdown(df[indicator])
-                else:
-                    volatility = 0
-                    max_drawdown = 0
-                performance_metrics[indicator] = {
-                    'current_value': current_value,
-                    'total_return': total_return,
-                    'recent_30d_change': recent_change,
-                    'volatility': volatility,
-                    'max_drawdown': max_drawdown,
-                    'category': indicator_config.get('category', 'unknown'),
-                    'name': indicator_config.get('name', indicator)
-                }
-                logger.performance_metric(
-                    f"{indicator} Total Return", 
-                    total_return, 
-                    "%"
-                )
+        for k, indicator in enumerate(indicators):
+            indicator_config = get_config().get_indicator_config(indicator)
+            performance_metrics[indicator] = {
+                'current_value': current_values[k],
+                'total_return': total_returns[k],
+                'recent_30d_change': recent_changes[k],
+                'volatility': volatilities[k],
+                'max_drawdown': max_drawdowns[k],
+                'category': indicator_config.get('category', 'unknown'),
+                'name': indicator_config.get('name', indicator)
+            }
+            logger.performance_metric(
+                f"{indicator} Total Return", 
+                total_returns[k], 
+                "%"
+            )
         return performance_metrics
     def detect_market_regime(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Detect current market regime based on key indicators."""
         recent_data = df.tail(30)
         regime_indicators = {}
-        if 'VIX' in recent_data.columns:
-            avg_vix = recent_data['VIX'].mean()
-            if avg_vix > 30:
-                vix_regime = "High Stress"
-            elif avg_vix > 20:
-                vix_regime = "Elevated Risk"  
-            else:
-                vix_regime = "Complacent"
-            regime_indicators['volatility'] = {
-                'level': avg_vix,
-                'regime': vix_regime
-            }
-        if 'TNX' in recent_data.columns:
-            avg_yield = recent_data['TNX'].mean() * 100
-            if avg_yield > 5:
-                rate_regime = "Restrictive"
-            elif avg_yield > 3:
-                rate_regime = "Neutral"
-            else:
-                rate_regime = "Accommodative"
-            regime_indicators['interest_rates'] = {
-                'level': avg_yield,
-                'regime': rate_regime
-            }
-        if 'BAMLH0A0HYM2' in recent_data.columns:
-            avg_spread = recent_data['BAMLH0A0HYM2'].mean()
-            if avg_spread > 6:
-                credit_regime = "Stress"
-            elif avg_spread > 4:
-                credit_regime = "Caution"
-            else:
-                credit_regime = "Benign"
-            regime_indicators['credit'] = {
-                'level': avg_spread,
-                'regime': credit_regime
+        present = [indicator for indicator in self.REGIME_THRESHOLDS if indicator in recent_data.columns]
+        means = recent_data[present].mean().to_numpy(dtype=np.float64)
+        for indicator, mean in zip(present, means):
+            key, scale, thresholds, regimes = self.REGIME_THRESHOLDS[indicator]
+            level = mean * scale
+            band = np.digitize(level, thresholds, right=True) if not np.isnan(level) else 0
+            regime_indicators[key] = {
+                'level': level,
+                'regime': regimes[band]
             }
         risk_assets = ['NDX', 'BTCUSD']
         momentum_scores = []
@@ -181,34 +217,148 @@ class EconomicAnalyzer:
     def generate_economic_insights(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate comprehensive economic insights."""
         logger.info("🧠 Generating economic insights...")
+        pl_df = self._to_polars(df) if self.use_polars else None
+        regime_analysis = self.analyze_regime_transitions(df, pl_df)
+        correlations = self.calculate_correlations(df, pl_df)
+        performance = self.analyze_performance_metrics(df, pl_df)
+        current_regime = self.detect_market_regime(df)
         insights = {
             'data_overview': {
                 'period': f"{df.index[0].strftime('%Y-%m-%d')} to {df.index[-1].strftime('%Y-%m-%d')}",
                 'total_days': len(df),
                 'indicators': len(df.columns)
             },
-            'regime_analysis': self.analyze_regime_transitions(df),
-            'correlations': self.calculate_correlations(df),
-            'performance': self.analyze_performance_metrics(df),
-            'current_regime': self.detect_market_regime(df),
-            'key_insights': self._generate_key_insights(df)
+            'regime_analysis': regime_analysis,
+            'correlations': correlations,
+            'performance': performance,
+            'current_regime': current_regime,
+            'key_insights': self._generate_key_insights(df, performance, correlations, current_regime)
         }
         logger.analysis_insight(f"Analysis complete for {len(df)} data points")
         return insights
+    def _to_polars(self, df: pd.DataFrame) -> Any:
+        """Convert df once to a Polars frame with a naive UTC timestamp column and NaN as null."""
+        index = df.index.tz_convert(None) if getattr(df.index, 'tz', None) is not None else df.index
+        return pl.from_pandas(df.set_axis(index).rename_axis(TIMESTAMP_COLUMN).reset_index())
+    def _regime_windows(self, df: pd.DataFrame, indicators: List[str]) -> Dict[str, Tuple]:
+        """_window_stats for every regime, from one groupby over a per-row regime label when regimes do not overlap."""
+        idx = df.index.values
+        bounds = [(np.searchsorted(idx, pd.Timestamp(regime['start']).to_datetime64()),
+                   np.searchsorted(idx, pd.Timestamp(regime['end']).to_datetime64(), side='right'))
+                  for regime in self.regimes.values()]
+        ordered = sorted((lo, hi) for lo, hi in bounds if hi > lo)
+        if any(lo < prev_hi for (_, prev_hi), (lo, _) in zip(ordered, ordered[1:])):
+            arr = df[indicators].to_numpy(dtype=ANALYSIS_DTYPE)
+            return {key: self._window_stats(arr[lo:hi]) if hi > lo else (0,) * 6
+                    for key, (lo, hi) in zip(self.regimes, bounds)}
+        labels = np.full(len(df), -1)
+        for code, (lo, hi) in enumerate(bounds):
+            labels[lo:hi] = code
+        grouped = df[indicators].astype(ANALYSIS_DTYPE).groupby(labels).agg(['count', 'first', 'last', 'mean', 'std'])
+        stats = {name: grouped.xs(name, level=1, axis=1).to_numpy(dtype=np.float64)
+                 for name in ('count', 'first', 'last', 'mean', 'std')}
+        windows = {}
+        for code, (key, (lo, hi)) in enumerate(zip(self.regimes, bounds)):
+            if hi <= lo:
+                windows[key] = (0,) * 6
+                continue
+            row = grouped.index.get_loc(code)
+            windows[key] = (hi - lo, stats['count'][row].astype(np.int64), stats['first'][row],
+                            stats['last'][row], stats['mean'][row], stats['std'][row])
+        return windows
+    def _window_stats(self, block: np.ndarray) -> Tuple:
+        """Row count, observation counts, first/last observations, means and stds of each column of a non-empty block."""
+        observed = ~np.isnan(block)
+        counts = observed.sum(axis=0)
+        cols = np.arange(block.shape[1])
+        start_values = block[observed.argmax(axis=0), cols]
+        end_values = block[len(block) - 1 - observed[::-1].argmax(axis=0), cols]
+        means = self._nanmean(block, counts)
+        return (len(block), counts, start_values, end_values,
+                means, self._nanstd(block, counts, means))
+    def _window_stats_polars(self, pl_df: Any, indicators: List[str],
+                             start_date: pd.Timestamp, end_date: pd.Timestamp) -> Tuple:
+        """Same statistics as _window_stats for the rows between two dates, as one Polars query."""
+        exprs = [pl.len().alias('__rows__')]
+        for name, expr in (('count', lambda c: pl.col(c).count()),
+                           ('first', lambda c: pl.col(c).drop_nulls().first()),
+                           ('last', lambda c: pl.col(c).drop_nulls().last()),
+                           ('mean', lambda c: pl.col(c).mean()),
+                           ('std', lambda c: pl.col(c).std())):
+            exprs.extend(expr(c).alias(f'{c}__{name}') for c in indicators)
+        row = (pl_df.lazy()
+               .filter(pl.col(TIMESTAMP_COLUMN).is_between(start_date.to_pydatetime(), end_date.to_pydatetime()))
+               .select(exprs)
+               .collect()
+               .row(0))
+        counts, start_values, end_values, means, stds = np.array(row[1:], dtype=np.float64).reshape(5, -1)
+        return row[0], counts.astype(np.int64), start_values, end_values, means, stds
+    def _performance_stats(self, arr: np.ndarray) -> Tuple:
+        """Current and first values, 30-day window means and daily return dispersion of each column."""
+        observed = ~np.isnan(arr)
+        start_values = arr[np.argmax(observed, axis=0), np.arange(arr.shape[1])]
+        previous = arr[-60:-30] if len(arr) >= 60 else arr[:30]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            returns = arr[1:] / arr[:-1] - 1
+        n_returns = (~np.isnan(returns)).sum(axis=0)
+        return (arr[-1], start_values, self._nanmean(arr[-30:]), self._nanmean(previous),
+                n_returns, self._nanstd(returns, n_returns))
+    def _performance_stats_polars(self, pl_df: Any, indicators: List[str]) -> Tuple:
+        """Same statistics as _performance_stats, as one Polars query."""
+        n = pl_df.height
+        offset, length = (n - 60, 30) if n >= 60 else (0, 30)
+        def returns(c):
+            return (pl.col(c) / pl.col(c).shift(1) - 1).fill_nan(None)
+        exprs = []
+        for name, expr in (('current', lambda c: pl.col(c).last()),
+                           ('first', lambda c: pl.col(c).drop_nulls().first()),
+                           ('recent', lambda c: pl.col(c).tail(30).mean()),
+                           ('previous', lambda c: pl.col(c).slice(offset, length).mean()),
+                           ('n_returns', lambda c: returns(c).count()),
+                           ('return_std', lambda c: returns(c).std())):
+            exprs.extend(expr(c).alias(f'{c}__{name}') for c in indicators)
+        row = pl_df.lazy().select(exprs).collect().row(0)
+        current, start, recent, previous, n_returns, return_stds = np.array(row, dtype=np.float64).reshape(6, -1)
+        return current, start, recent, previous, n_returns.astype(np.int64), return_stds
+    def _pearson_matrix_polars(self, pl_df: Any, df: pd.DataFrame) -> pd.DataFrame:
+        """Pearson correlation matrix from Polars, deferring to pearson_matrix when nulls are present."""
+        frame = pl_df.select(list(df.columns))
+        if frame.height < 2 or frame.null_count().to_numpy().any():
+            return pearson_matrix(df)
+        return pd.DataFrame(frame.corr().to_numpy(), index=df.columns, columns=df.columns)
+    def _nanmean(self, arr: np.ndarray, counts: Optional[np.ndarray] = None) -> np.ndarray:
+        """Column means skipping NaN, NaN for columns with no observations."""
+        if counts is None:
+            counts = (~np.isnan(arr)).sum(axis=0)
+        return np.where(counts > 0, np.nansum(arr, axis=0) / np.maximum(counts, 1), np.nan)
+    def _nanstd(self, arr: np.ndarray, counts: Optional[np.ndarray] = None,
+                means: Optional[np.ndarray] = None) -> np.ndarray:
+        """Column sample standard deviations (ddof=1) skipping NaN, as Series.std does."""
+        if counts is None:
+            counts = (~np.isnan(arr)).sum(axis=0)
+        if means is None:
+            means = self._nanmean(arr, counts)
+        squares = np.nansum((arr - means) ** 2, axis=0)
+        valid = (counts > 1) & ~np.isinf(arr).any(axis=0)
+        return np.where(valid, np.sqrt(squares / np.maximum(counts - 1, 1)), np.nan)
     def _calculate_max_drawdown(self, series: pd.Series) -> float:
         """Calculate maximum drawdown for a time series."""
         if series.empty:
             return 0
-        peak = series.expanding().max()
-        drawdown = (series - peak) / peak
-        max_drawdown = drawdown.min() * 100
-        return max_drawdown
-    def _identify_structural_relationships(self, correlations: List[Dict]) -> Dict[str, str]:
+        return _max_drawdowns(series.to_numpy(dtype=np.float64).reshape(-1, 1))[0] * 100
+    def _identify_structural_relationships(self, correlation_matrix: pd.DataFrame) -> Dict[str, str]:
         """Identify key structural economic relationships."""
+        columns = correlation_matrix.columns
+        matrix = correlation_matrix.to_numpy()
+        pairs = []
+        for var1, var2 in (('PCEPILFE', 'TNX'), ('NDX', 'BTCUSD'), ('WALCL', 'RRPONTSYD'), ('DXY', 'GOLD')):
+            if var1 in columns and var2 in columns:
+                row, col = sorted((columns.get_loc(var1), columns.get_loc(var2)))
+                if not np.isnan(matrix[row, col]):
+                    pairs.append((var1, var2, matrix[row, col]))
+        pairs.sort(key=lambda pair: -abs(pair[2]))
         relationships = {}
-        for corr_data in correlations:
-            var1, var2 = corr_data['var1'], corr_data['var2']
-            corr_value = corr_data['correlation']
+        for var1, var2, corr_value in pairs:
             if set([var1, var2]) == set(['PCEPILFE', 'TNX']) and corr_value > 0.8:
                 relationships['fisher_effect'] = f"Strong positive correlation ({corr_value:.3f}) confirms Fisher Effect"
             if set([var1, var2]) == set(['NDX', 'BTCUSD']) and corr_value > 0.8:
@@ -221,27 +371,34 @@ class EconomicAnalyzer:
                 elif corr_value > 0.3:
                     relationships['safe_haven'] = f"Positive correlation ({corr_value:.3f}) shows safe haven convergence"
         return relationships
-    def _generate_key_insights(self, df: pd.DataFrame) -> List[str]:
-        """Generate key narrative insights."""
+    def _generate_key_insights(self, df: pd.DataFrame, performance: Dict[str, Any],
+                               correlations: Dict[str, Any], current_regime: Dict[str, Any]) -> List[str]:
+        """Generate key narrative insights from the metrics already computed for df."""
         insights = []
-        if 'BTCUSD' in df.columns:
-            btc_start = df['BTCUSD'].dropna().iloc[0]
-            btc_current = df['BTCUSD'].iloc[-1]
-            btc_return = ((btc_current - btc_start) / btc_start) * 100
+        if 'BTCUSD' in performance:
+            btc_return = performance['BTCUSD']['total_return']
             if btc_return > 500:
                 insights.append(f"Bitcoin demonstrates exceptional wealth creation with {btc_return:.0f}% total return")
-        if 'M2SL' in df.columns and 'WALCL' in df.columns:
-            m2_change = (df['M2SL'].iloc[-1] - df['M2SL'].iloc[0]) / df['M2SL'].iloc[0] * 100
-            fed_change = (df['WALCL'].iloc[-1] - df['WALCL'].iloc[0]) / df['WALCL'].iloc[0] * 100
+        if 'M2SL' in performance and 'WALCL' in performance:
+            m2_change = performance['M2SL']['total_return']
+            fed_change = performance['WALCL']['total_return']
             if m2_change > 10 and fed_change < 0:
                 insights.append("Money supply growth continues while Fed balance sheet normalizes")
-        if 'VIX' in df.columns:
-            recent_vix = df['VIX'].tail(30).mean()
+        if 'volatility' in current_regime:
+            recent_vix = current_regime['volatility']['level']
             if recent_vix < 20:
                 insights.append(f"Low volatility environment (VIX: {recent_vix:.1f}) suggests market complacency")
         if 'NDX' in df.columns and 'BTCUSD' in df.columns:
-            correlation = df[['NDX', 'BTCUSD']].corr().iloc[0, 1]
+            correlation = correlations['correlation_matrix'].at['NDX', 'BTCUSD']
             if correlation > 0.8:
                 insights.append(f"Strong NASDAQ-Bitcoin correlation ({correlation:.2f}) indicates institutional adoption")
         return insights
-economic_analyzer = EconomicAnalyzer()
\ No newline at end of file
+@functools.lru_cache(maxsize=None)
+def get_analyzer() -> EconomicAnalyzer:
+    """Return the shared EconomicAnalyzer, creating it on first use."""
+    return EconomicAnalyzer()
+def __getattr__(name: str) -> Any:
+    """Build the module-level economic_analyzer singleton lazily on first access."""
+    if name == 'economic_analyzer':
+        return get_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
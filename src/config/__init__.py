@@ -1,24 +1,32 @@
 """Configuration management for economic analysis system."""
 import yaml
 import os
+import functools
 from pathlib import Path
 from typing import Dict, Any
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
 class Config:
     """Configuration manager for economic indicators and analysis settings."""
     def __init__(self, config_path: str = None):
         """Initialize configuration from YAML file."""
         if config_path is None:
             config_path = Path(__file__).parent / "indicators.yml"
-        with open(config_path, 'r') as f:
-            self._config = yaml.safe_load(f)
-    @property
-    def fred_series(self) -> Dict[str, Any]:
-        """Get FRED series configuration."""
-        return self._config['fred_series']
-    @property
-    def yahoo_tickers(self) -> Dict[str, Any]:
-        """Get Yahoo Finance ticker configuration."""
-        return self._config['yahoo_tickers']
+        self._config = self._load(Path(config_path))
+        self.fred_series: Dict[str, Any] = self._config['fred_series']
+        self.yahoo_tickers: Dict[str, Any] = self._config['yahoo_tickers']
+        self._all_indicators = list(self.fred_series) + list(self.yahoo_tickers)
+        self._indicator_config = {
+            **{k: {**v, 'source': 'yahoo'} for k, v in self.yahoo_tickers.items()},
+            **{k: {**v, 'source': 'fred'} for k, v in self.fred_series.items()}
+        }
+    @staticmethod
+    def _load(config_path: Path) -> Dict[str, Any]:
+        """Parse the YAML file with the libyaml loader when available."""
+        with open(config_path, 'rb') as f:
+            return yaml.load(f, Loader=_Loader)
     @property
     def stock_variables(self) -> list:
         """Get list of stock (cumulative) variables."""
@@ -45,11 +53,10 @@ class Config:
         return self._config['apis']
     def get_indicator_config(self, indicator: str) -> Dict[str, Any]:
         """Get configuration for a specific indicator."""
-        if indicator in self.fred_series:
-            return {**self.fred_series[indicator], 'source': 'fred'}
-        if indicator in self.yahoo_tickers:
-            return {**self.yahoo_tickers[indicator], 'source': 'yahoo'}
-        raise KeyError(f"Indicator '{indicator}' not found in configuration")
+        try:
+            return dict(self._indicator_config[indicator])
+        except KeyError:
+            raise KeyError(f"Indicator '{indicator}' not found in configuration") from None
     def get_indicators_by_category(self, category: str) -> Dict[str, Any]:
         """Get all indicators in a specific category."""
         indicators = {}
@@ -62,5 +69,13 @@ class Config:
         return indicators
     def get_all_indicators(self) -> list:
         """Get list of all configured indicators."""
-        return list(self.fred_series.keys()) + list(self.yahoo_tickers.keys())
-config = Config()
\ No newline at end of file
+        return list(self._all_indicators)
+@functools.lru_cache(maxsize=None)
+def get_config() -> Config:
+    """Return the shared Config, parsing indicators.yml on first use."""
+    return Config()
+def __getattr__(name: str) -> Any:
+    """Build the module-level config singleton lazily on first access."""
+    if name == 'config':
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
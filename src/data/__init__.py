@@ -1,3 +1,8 @@
 """Data fetching module."""
-from .fetcher import DataFetcher, data_fetcher
-__all__ = ['DataFetcher', 'data_fetcher']
\ No newline at end of file
+from .fetcher import DataFetcher, get_fetcher
+__all__ = ['DataFetcher', 'get_fetcher', 'data_fetcher']
+def __getattr__(name: str):
+    """Resolve data_fetcher lazily so importing the package does not build it."""
+    if name == 'data_fetcher':
+        return get_fetcher()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -2,31 +2,52 @@
 import requests
 import pandas as pd
 import yfinance as yf
+import asyncio
+import functools
+import importlib.util
 import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date
-from typing import Dict, List, Optional, Any
-from ..config import config
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from ..config import get_config
 from ..utils.logger import logger
+try:
+    import pyarrow.csv as pacsv
+except ImportError:
+    pacsv = None
+try:
+    import httpx
+except ImportError:
+    httpx = None
+MAX_FETCH_WORKERS = 16
+HTTP2 = importlib.util.find_spec('h2') is not None
+@functools.lru_cache(maxsize=None)
+def _http_session() -> requests.Session:
+    """Return the shared keep-alive session, pooling one connection per fetch worker and retrying transient failures."""
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=MAX_FETCH_WORKERS, pool_maxsize=MAX_FETCH_WORKERS,
+                          max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
 class DataFetcher:
     """Centralized data fetching system for economic indicators."""
     def __init__(self):
         """Initialize data fetcher with configuration."""
-        self.fred_config = config.api_settings['fred']
-        self.yahoo_config = config.api_settings['yahoo']
+        self.fred_config = get_config().api_settings['fred']
+        self.yahoo_config = get_config().api_settings['yahoo']
     def fetch_fred_current(self, series_id: str) -> Optional[float]:
         """Fetch current value from FRED API."""
         try:
             url = f"{self.fred_config['base_url']}?id={series_id}"
-            df = pd.read_csv(url)
-            if df.empty:
-                return None
-            col = df.columns[-1]
-            value = df.iloc[-1][col]
-            if pd.isna(value) or value == '.':
-                return None
-            result = float(value)
-            logger.data_fetch_success('FRED', series_id, result)
-            return result
+            content = self._get_revalidated(url, series_id, self.fred_config['timeout'])
+            return self._parse_fred_current(series_id, content)
         except Exception as e:
             logger.data_fetch_error('FRED', series_id, str(e))
             return None
@@ -34,21 +55,8 @@ class DataFetcher:
         """Fetch historical data from FRED API."""
         try:
             url = f"{self.fred_config['base_url']}?id={series_id}"
-            response = requests.get(url, timeout=self.fred_config['timeout'])
-            response.raise_for_status()
-            df = pd.read_csv(io.StringIO(response.text))
-            col = df.columns[-1]
-            date_col = "DATE" if "DATE" in df.columns else (
-                "observation_date" if "observation_date" in df.columns else None
-            )
-            if date_col is None:
-                logger.data_fetch_error('FRED', series_id, "No date column found")
-                return None
-            df = self._to_date_index(df, date_col)
-            series = pd.to_numeric(df[col], errors="coerce").dropna()
-            series = series[series.index.date >= start_date]
-            logger.data_fetch_success('FRED', f"{series_id}_history", len(series))
-            return series
+            content = self._get_revalidated(url, series_id, self.fred_config['timeout'])
+            return self._parse_fred_history(series_id, content, start_date)
         except Exception as e:
             logger.data_fetch_error('FRED', f"{series_id}_history", str(e))
             return None
@@ -65,7 +73,7 @@ class DataFetcher:
             except Exception:
                 try:
                     url = f"{self.yahoo_config['fallback_url']}?symbols={symbol}"
-                    response = requests.get(url, timeout=self.yahoo_config['timeout'])
+                    response = _http_session().get(url, timeout=self.yahoo_config['timeout'])
                     response.raise_for_status()
                     data = response.json()
                     if data.get("quoteResponse", {}).get("result"):
@@ -77,9 +85,62 @@ class DataFetcher:
                     continue
         logger.data_fetch_error('Yahoo', str(symbols), "All symbols failed")
         return None
+    def fetch_yahoo_batch(self, symbols: List[str]) -> Dict[str, float]:
+        """Fetch the latest close of several Yahoo symbols in one threaded download, omitting symbols without data."""
+        if not symbols:
+            return {}
+        try:
+            df = yf.download(symbols, period="5d", interval="1d", group_by="ticker",
+                             threads=True, progress=False)
+            closes = df.xs("Close", axis=1, level=1)
+        except Exception as e:
+            logger.data_fetch_error('Yahoo', str(symbols), str(e))
+            return {}
+        results = {}
+        for symbol in symbols:
+            if symbol in closes:
+                series = closes[symbol].dropna()
+                if not series.empty:
+                    results[symbol] = float(series.iloc[-1])
+                    logger.data_fetch_success('Yahoo', symbol, results[symbol])
+        return results
+    def fetch_yahoo_history_batch(self, symbols: List[str], period: str = "5y") -> Dict[str, pd.Series]:
+        """Fetch the daily closes of several Yahoo symbols in one threaded download, omitting symbols without data."""
+        results = {}
+        missing = []
+        for symbol in symbols:
+            series = self._cached_yahoo_history(symbol, period)
+            if series is not None:
+                results[symbol] = series
+            else:
+                missing.append(symbol)
+        if not missing:
+            return results
+        try:
+            df = yf.download(missing, period=period, interval="1d", group_by="ticker",
+                             threads=True, progress=False)
+            closes = self._to_date_index(df.xs("Close", axis=1, level=1))
+        except Exception as e:
+            logger.data_fetch_error('Yahoo', f"{missing}_history", str(e))
+            return results
+        for symbol in missing:
+            if symbol in closes:
+                series = closes[symbol].dropna()
+                if not series.empty:
+                    series.name = "Close"
+                    results[symbol] = series
+                    logger.data_fetch_success('Yahoo', f"{symbol}_history", len(series))
+                    cache_file = self._yahoo_history_file(symbol, period)
+                    if cache_file is not None:
+                        self._store_yahoo_history(cache_file, series)
+        return results
     def fetch_yahoo_history(self, symbols: List[str], period: str = "5y") -> Optional[pd.Series]:
-        """Fetch historical data from Yahoo Finance."""
+        """Fetch historical data from Yahoo Finance, reusing a download already made today."""
         for symbol in symbols:
+            series = self._cached_yahoo_history(symbol, period)
+            if series is not None:
+                return series
+            cache_file = self._yahoo_history_file(symbol, period)
             try:
                 ticker = yf.Ticker(symbol)
                 hist = ticker.history(period=period, interval="1d")
@@ -87,19 +148,66 @@ class DataFetcher:
                     series = hist["Close"].copy()
                     series = self._to_date_index(series.to_frame()).iloc[:, 0]
                     logger.data_fetch_success('Yahoo', f"{symbol}_history", len(series))
+                    if cache_file is not None:
+                        self._store_yahoo_history(cache_file, series)
                     return series
             except Exception as e:
                 logger.data_fetch_error('Yahoo', f"{symbol}_history", str(e))
                 continue
         logger.data_fetch_error('Yahoo', f"{symbols}_history", "All symbols failed")
         return None
+    async def fetch_fred_async(self, series_ids: List[str],
+                               start_date: Optional[date] = None) -> Dict[str, Any]:
+        """Fetch FRED series concurrently on one httpx client: histories when start_date is given, else latest values."""
+        async with httpx.AsyncClient(http2=HTTP2, timeout=self.fred_config['timeout']) as client:
+            async def fetch(series_id: str) -> Any:
+                try:
+                    url = f"{self.fred_config['base_url']}?id={series_id}"
+                    headers = self._validator_headers(series_id)
+                    response = await client.get(url, headers=headers)
+                    content = self._revalidated_body(series_id, response, headers)
+                    if start_date is None:
+                        return self._parse_fred_current(series_id, content)
+                    return self._parse_fred_history(series_id, content, start_date)
+                except Exception as e:
+                    logger.data_fetch_error('FRED', series_id if start_date is None else f"{series_id}_history", str(e))
+                    return None
+            results = await asyncio.gather(*(fetch(series_id) for series_id in series_ids))
+        return dict(zip(series_ids, results))
     def fetch_all_current(self, fallback_data: Optional[Dict] = None) -> Dict[str, Any]:
         """Fetch current values for all configured indicators."""
         results = {}
         fallback = fallback_data or {}
-        logger.data_fetch_start('FRED', list(config.fred_series.keys()))
-        for series_id, indicator_config in config.fred_series.items():
-            value = self.fetch_fred_current(series_id)
+        logger.data_fetch_start('FRED', list(get_config().fred_series.keys()))
+        logger.data_fetch_start('Yahoo', list(get_config().yahoo_tickers.keys()))
+        today = datetime.utcnow().date().isoformat()
+        cached = self._cached_values(today)
+        if cached:
+            logger.info(f"♻️ Reusing {len(cached)} values already fetched on {today}")
+        fred_ids = [series_id for series_id in get_config().fred_series if ('FRED', series_id) not in cached]
+        primary = {ticker_id: ticker_config['symbols'][0]
+                   for ticker_id, ticker_config in get_config().yahoo_tickers.items()
+                   if ('Yahoo', ticker_id) not in cached}
+        with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+            batch_future = executor.submit(self.fetch_yahoo_batch, list(dict.fromkeys(primary.values())))
+            if self._use_async_http():
+                fred_values = asyncio.run(self.fetch_fred_async(fred_ids))
+            else:
+                fred_futures = {series_id: executor.submit(self.fetch_fred_current, series_id)
+                                for series_id in fred_ids}
+                fred_values = {series_id: future.result() for series_id, future in fred_futures.items()}
+            batch = batch_future.result()
+            yahoo_futures = {ticker_id: executor.submit(self.fetch_yahoo_current,
+                                                         get_config().yahoo_tickers[ticker_id]['symbols'])
+                             for ticker_id, symbol in primary.items() if symbol not in batch}
+        yahoo_values = {ticker_id: batch[symbol] if symbol in batch else yahoo_futures[ticker_id].result()
+                        for ticker_id, symbol in primary.items()}
+        fetched = {**{('FRED', series_id): value for series_id, value in fred_values.items()},
+                   **{('Yahoo', ticker_id): value for ticker_id, value in yahoo_values.items()}}
+        self._store_values(today, {key: value for key, value in fetched.items() if value is not None})
+        values = {**cached, **fetched}
+        for series_id, indicator_config in get_config().fred_series.items():
+            value = values[('FRED', series_id)]
             if value is not None and indicator_config.get('display_scale', 1) != 1:
                 value = value * indicator_config['display_scale']
             if value is None and fallback:
@@ -107,9 +215,8 @@ class DataFetcher:
                 if value is not None:
                     logger.info(f"🔄 Using fallback for {series_id}: {value}")
             results[series_id] = value
-        logger.data_fetch_start('Yahoo', list(config.yahoo_tickers.keys()))
-        for ticker_id, ticker_config in config.yahoo_tickers.items():
-            value = self.fetch_yahoo_current(ticker_config['symbols'])
+        for ticker_id, ticker_config in get_config().yahoo_tickers.items():
+            value = values[('Yahoo', ticker_id)]
             if value is not None and ticker_config.get('display_scale', 1) != 1:
                 value = value * ticker_config['display_scale']
             if value is None and fallback:
@@ -121,34 +228,206 @@ class DataFetcher:
     def fetch_all_history(self, start_date: date) -> pd.DataFrame:
         """Fetch historical data for all configured indicators."""
         date_index = pd.date_range(start=start_date, end=datetime.now().date(), freq="D")
-        df = pd.DataFrame(index=date_index)
-        logger.data_fetch_start('FRED', list(config.fred_series.keys()))
-        for series_id, indicator_config in config.fred_series.items():
-            series = self.fetch_fred_history(series_id, start_date)
+        fetched = {}
+        logger.data_fetch_start('FRED', list(get_config().fred_series.keys()))
+        logger.data_fetch_start('Yahoo', list(get_config().yahoo_tickers.keys()))
+        primary = {ticker_id: ticker_config['symbols'][0]
+                   for ticker_id, ticker_config in get_config().yahoo_tickers.items()}
+        with ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS) as executor:
+            batch_future = executor.submit(self.fetch_yahoo_history_batch, list(dict.fromkeys(primary.values())))
+            if self._use_async_http():
+                fred_histories = asyncio.run(self.fetch_fred_async(list(get_config().fred_series), start_date))
+            else:
+                fred_futures = {series_id: executor.submit(self.fetch_fred_history, series_id, start_date)
+                                for series_id in get_config().fred_series}
+                fred_histories = {series_id: future.result() for series_id, future in fred_futures.items()}
+            batch = batch_future.result()
+            yahoo_futures = {ticker_id: executor.submit(self.fetch_yahoo_history,
+                                                         get_config().yahoo_tickers[ticker_id]['symbols'])
+                             for ticker_id, symbol in primary.items() if symbol not in batch}
+        yahoo_histories = {ticker_id: batch[symbol] if symbol in batch else yahoo_futures[ticker_id].result()
+                           for ticker_id, symbol in primary.items()}
+        for series_id, indicator_config in get_config().fred_series.items():
+            series = fred_histories[series_id]
             if series is not None and not series.empty:
                 if indicator_config.get('display_scale', 1) != 1:
                     series = series * indicator_config['display_scale']
-                df[series_id] = series
-        logger.data_fetch_start('Yahoo', list(config.yahoo_tickers.keys()))
-        for ticker_id, ticker_config in config.yahoo_tickers.items():
-            series = self.fetch_yahoo_history(ticker_config['symbols'])
+                fetched[series_id] = series
+        for ticker_id, ticker_config in get_config().yahoo_tickers.items():
+            series = yahoo_histories[ticker_id]
             if series is not None and not series.empty:
                 if ticker_config.get('display_scale', 1) != 1:
                     series = series * ticker_config['display_scale']
-                df[ticker_id] = series
-        for indicator in config.get_all_indicators():
-            if indicator not in df.columns:
-                df[indicator] = pd.Series(index=df.index, dtype=float)
-        df = df.sort_index().ffill().bfill()
-        df = df.dropna(how='all')
+                fetched[ticker_id] = series
+        df = pd.DataFrame(fetched, index=date_index).reindex(columns=get_config().get_all_indicators())
+        df = df.ffill().bfill()
+        if len(df) and df.iloc[0].isna().all():
+            df = df.iloc[:0]
         logger.info(f"📊 Historical data fetched: {len(df)} days, {len(df.columns)} indicators")
         return df
+    def _use_async_http(self) -> bool:
+        """Whether FRED requests go through fetch_fred_async rather than the thread pool."""
+        return httpx is not None and self.fred_config.get('async_http', False)
+    def _parse_fred_current(self, series_id: str, content: bytes) -> Optional[float]:
+        """Latest value of a downloaded FRED CSV, parsed from its last line, or from the whole file if that line is malformed."""
+        lines = content.rstrip().rsplit(b'\n', 1)
+        if len(lines) < 2:
+            return None
+        value = lines[-1].rsplit(b',', 1)[-1].strip()
+        if value in (b'', b'.'):
+            return None
+        try:
+            result = float(value)
+        except ValueError:
+            df = self._read_csv_bytes(content)
+            if df.empty or pd.isna(df.iloc[-1, -1]):
+                return None
+            result = float(df.iloc[-1, -1])
+        if pd.isna(result):
+            return None
+        logger.data_fetch_success('FRED', series_id, result)
+        return result
+    def _parse_fred_history(self, series_id: str, content: bytes, start_date: date) -> Optional[pd.Series]:
+        """Date-indexed series from a downloaded FRED CSV, starting at start_date."""
+        df = self._read_csv_bytes(content)
+        col = df.columns[-1]
+        date_col = "DATE" if "DATE" in df.columns else (
+            "observation_date" if "observation_date" in df.columns else None
+        )
+        if date_col is None:
+            logger.data_fetch_error('FRED', series_id, "No date column found")
+            return None
+        df = self._to_date_index(df, date_col)
+        series = pd.to_numeric(df[col], errors="coerce").dropna()
+        series = series[series.index >= pd.Timestamp(start_date)]
+        logger.data_fetch_success('FRED', f"{series_id}_history", len(series))
+        return series
+    def _yahoo_history_file(self, symbol: str, period: str) -> Optional[Path]:
+        """Parquet file for today's download of symbol's history, or None when the Yahoo cache is disabled."""
+        cache_dir = self.yahoo_config.get('cache_dir')
+        if not cache_dir:
+            return None
+        return Path(cache_dir) / f"{symbol}_{period}_{datetime.utcnow():%Y%m%d}.parquet"
+    def _cached_yahoo_history(self, symbol: str, period: str) -> Optional[pd.Series]:
+        """Today's cached download of symbol's history, or None when it is not cached."""
+        cache_file = self._yahoo_history_file(symbol, period)
+        if cache_file is None or not cache_file.exists():
+            return None
+        try:
+            series = pd.read_parquet(cache_file).iloc[:, 0]
+        except Exception as e:
+            logger.warning(f"Could not read {cache_file}: {e}")
+            return None
+        logger.debug(f"♻️ {symbol}_history already downloaded today, using {cache_file}")
+        return series
+    def _store_yahoo_history(self, cache_file: Path, series: pd.Series) -> None:
+        """Write series to cache_file and drop the symbol's downloads from earlier days."""
+        prefix = cache_file.name[:-len("YYYYMMDD.parquet")]
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            for stale in cache_file.parent.glob(f"{prefix}*.parquet"):
+                if stale != cache_file:
+                    stale.unlink()
+            series.to_frame().to_parquet(cache_file)
+        except Exception as e:
+            logger.warning(f"Could not cache {cache_file}: {e}")
+    def _value_cache_file(self) -> Optional[Path]:
+        """Parquet file holding the day's fetched values, or None when the value cache is disabled."""
+        path = get_config().data_settings.get('value_cache')
+        return Path(path) if path else None
+    def _cached_values(self, day: str) -> Dict[Tuple[str, str], float]:
+        """Raw values already fetched on day, keyed by (source, series)."""
+        path = self._value_cache_file()
+        if path is None or not path.exists():
+            return {}
+        try:
+            df = pd.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Could not read {path}: {e}")
+            return {}
+        df = df[df['date'] == day]
+        return {(source, series): float(value)
+                for source, series, value in zip(df['source'], df['series'], df['value'])}
+    def _store_values(self, day: str, values: Dict[Tuple[str, str], float]) -> None:
+        """Add newly fetched raw values to the value cache, which only keeps rows for day."""
+        path = self._value_cache_file()
+        if path is None or not values:
+            return
+        rows = {**self._cached_values(day), **values}
+        df = pd.DataFrame({
+            'source': [source for source, _ in rows],
+            'series': [series for _, series in rows],
+            'date': day,
+            'value': list(rows.values())
+        })
+        tmp_file = path.with_suffix('.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(tmp_file, compression='zstd', index=False)
+            os.replace(tmp_file, path)
+        except Exception as e:
+            logger.warning(f"Could not cache values in {path}: {e}")
+    def _read_csv_bytes(self, content: bytes) -> pd.DataFrame:
+        """Parse a FRED CSV body with pyarrow's multithreaded reader, or pandas when pyarrow is not installed."""
+        if pacsv is None:
+            return pd.read_csv(io.BytesIO(content), na_values=['.'])
+        convert_options = pacsv.ConvertOptions(null_values=['', '.'], strings_can_be_null=True)
+        return pacsv.read_csv(io.BytesIO(content), convert_options=convert_options).to_pandas(date_as_object=False)
+    def _get_revalidated(self, url: str, cache_key: str, timeout: float) -> bytes:
+        """GET url, revalidating a disk copy with ETag/Last-Modified so unchanged series are not re-downloaded."""
+        headers = self._validator_headers(cache_key)
+        response = _http_session().get(url, timeout=timeout, headers=headers)
+        return self._revalidated_body(cache_key, response, headers)
+    def _cache_files(self, cache_key: str):
+        """Paths of the cached body and its validators for cache_key."""
+        cache_dir = Path(self.fred_config.get('cache_dir', '.cache/fred'))
+        return cache_dir / f"{cache_key}.csv", cache_dir / f"{cache_key}.json"
+    def _validator_headers(self, cache_key: str) -> Dict[str, str]:
+        """Conditional request headers for the cached copy of cache_key, if there is one."""
+        body_file, meta_file = self._cache_files(cache_key)
+        headers = {}
+        if body_file.exists() and meta_file.exists():
+            meta = json.loads(meta_file.read_text())
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+    def _revalidated_body(self, cache_key: str, response: Any, headers: Dict[str, str]) -> bytes:
+        """Body for a conditional response: the cached copy on 304, else the new body, cached with its validators."""
+        body_file, meta_file = self._cache_files(cache_key)
+        if response.status_code == 304 and headers:
+            logger.debug(f"♻️ {cache_key} unchanged upstream, using cached copy")
+            return body_file.read_bytes()
+        response.raise_for_status()
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        validators = {key: value for key, value in validators.items() if isinstance(value, str)}
+        if validators:
+            try:
+                body_file.parent.mkdir(parents=True, exist_ok=True)
+                body_file.write_bytes(response.content)
+                meta_file.write_text(json.dumps(validators))
+            except OSError as e:
+                logger.warning(f"Could not cache {cache_key}: {e}")
+        return response.content
     def _to_date_index(self, df: pd.DataFrame, date_col: str = None) -> pd.DataFrame:
-        """Convert DataFrame to date index."""
+        """Convert DataFrame to date index, parsing the dates only when they are not datetime64 already."""
         if date_col:
-            df[date_col] = pd.to_datetime(df[date_col]).dt.tz_localize(None)
             df = df.set_index(date_col)
-        df.index = pd.to_datetime(df.index).tz_localize(None)
-        df.index = df.index.normalize()
+        index = df.index if isinstance(df.index, pd.DatetimeIndex) else pd.to_datetime(df.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        df.index = index.normalize()
         return df
-data_fetcher = DataFetcher()
\ No newline at end of file
+@functools.lru_cache(maxsize=None)
+def get_fetcher() -> DataFetcher:
+    """Return the shared DataFetcher, creating it on first use."""
+    return DataFetcher()
+def __getattr__(name: str) -> Any:
+    """Build the module-level data_fetcher singleton lazily on first access."""
+    if name == 'data_fetcher':
+        return get_fetcher()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
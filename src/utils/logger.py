@@ -1,24 +1,78 @@
 """Logging utilities for economic analysis system."""
+import atexit
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-class EconomicAnalysisLogger:
-    """Centralized logging system for economic analysis pipeline."""
-    def __init__(self, name: str = "economic_analysis", log_level: str = "INFO"):
-        """Initialize logger with specified name and level."""
-        self.logger = logging.getLogger(name)
-        self.logger.setLevel(getattr(logging, log_level.upper()))
-        if not self.logger.handlers:
-            self._setup_handlers()
-    def _setup_handlers(self):
-        """Set up console and file handlers."""
+LOG_BUFFER_SIZE = 128 * 1024
+LOG_FLUSH_INTERVAL = 1.0
+LOG_FILE = Path("logs") / f"economic_analysis_{datetime.now():%Y%m%d}.log"
+_QUEUE_HANDLERS = {}
+_QUEUE_HANDLERS_LOCK = threading.Lock()
+class _DeferredFlushFileHandler(logging.FileHandler):
+    """FileHandler that writes into a LOG_BUFFER_SIZE buffer without flushing, leaving the flush to the queue listener."""
+    def _open(self):
+        """Open the log file with a LOG_BUFFER_SIZE write buffer."""
+        return open(self.baseFilename, self.mode, buffering=LOG_BUFFER_SIZE,
+                    encoding=self.encoding, errors=self.errors)
+    def emit(self, record: logging.LogRecord):
+        """Write the formatted record to the file buffer."""
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+class _BatchingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers at most every LOG_FLUSH_INTERVAL seconds, on errors, when idle and on stop."""
+    def __init__(self, *args, **kwargs):
+        """Create the listener with nothing pending."""
+        super().__init__(*args, **kwargs)
+        self._dirty = False
+        self._last_flush = time.monotonic()
+    def flush(self):
+        """Flush every handler, skipping streams that were already closed, as logging.shutdown does."""
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                pass
+        self._dirty = False
+        self._last_flush = time.monotonic()
+    def dequeue(self, block: bool):
+        """Wait for the next record, flushing pending output whenever the queue stays idle for LOG_FLUSH_INTERVAL."""
+        while True:
+            try:
+                return self.queue.get(block, timeout=LOG_FLUSH_INTERVAL if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+                if self._dirty:
+                    self.flush()
+    def handle(self, record: logging.LogRecord):
+        """Handle a record, flushing if it is an error or the last flush is LOG_FLUSH_INTERVAL old."""
+        super().handle(record)
+        self._dirty = True
+        if record.levelno >= logging.ERROR or time.monotonic() - self._last_flush >= LOG_FLUSH_INTERVAL:
+            self.flush()
+    def stop(self):
+        """Drain the queue, stop the thread and flush what is left."""
+        super().stop()
+        self.flush()
+def _shared_queue_handler(log_file: Path) -> QueueHandler:
+    """Return the QueueHandler feeding log_file's console and file handlers, starting their listener on first use."""
+    with _QUEUE_HANDLERS_LOCK:
+        if log_file in _QUEUE_HANDLERS:
+            return _QUEUE_HANDLERS[log_file]
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-        log_file = Path("logs") / f"economic_analysis_{datetime.now().strftime('%Y%m%d')}.log"
         log_file.parent.mkdir(exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
+        file_handler = _DeferredFlushFileHandler(log_file)
         file_handler.setLevel(logging.DEBUG)
         console_formatter = logging.Formatter(
             '%(asctime)s | %(levelname)s | %(message)s',
@@ -30,58 +84,83 @@ class EconomicAnalysisLogger:
         )
         console_handler.setFormatter(console_formatter)
         file_handler.setFormatter(file_formatter)
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
-    def info(self, message: str, **kwargs):
-        """Log info message."""
-        self.logger.info(message, **kwargs)
-    def warning(self, message: str, **kwargs):
-        """Log warning message."""
-        self.logger.warning(message, **kwargs)
-    def error(self, message: str, **kwargs):
-        """Log error message."""
-        self.logger.error(message, **kwargs)
-    def debug(self, message: str, **kwargs):
-        """Log debug message."""
-        self.logger.debug(message, **kwargs)
+        log_queue = queue.SimpleQueue()
+        listener = _BatchingQueueListener(log_queue, console_handler, file_handler,
+                                          respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        _QUEUE_HANDLERS[log_file] = QueueHandler(log_queue)
+        return _QUEUE_HANDLERS[log_file]
+class EconomicAnalysisLogger:
+    """Centralized logging system for economic analysis pipeline."""
+    def __init__(self, name: str = "economic_analysis", log_level: str = "INFO"):
+        """Initialize logger with specified name and level."""
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(getattr(logging, log_level.upper()))
+        if not self.logger.handlers:
+            self.logger.addHandler(_shared_queue_handler(LOG_FILE))
+        self._info = self.logger.info
+        self._warning = self.logger.warning
+        self._error = self.logger.error
+        self._debug = self.logger.debug
+    def info(self, message: str, *args, **kwargs):
+        """Log info message, %-formatting args only if the record is emitted."""
+        self._info(message, *args, **kwargs)
+    def warning(self, message: str, *args, **kwargs):
+        """Log warning message, %-formatting args only if the record is emitted."""
+        self._warning(message, *args, **kwargs)
+    def error(self, message: str, *args, **kwargs):
+        """Log error message, %-formatting args only if the record is emitted."""
+        self._error(message, *args, **kwargs)
+    def debug(self, message: str, *args, **kwargs):
+        """Log debug message, %-formatting args only if the record is emitted."""
+        self._debug(message, *args, **kwargs)
     def data_fetch_start(self, source: str, indicators: list):
         """Log start of data fetching."""
-        self.info(f"🚀 Starting data fetch from {source}: {', '.join(indicators)}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self._info("🚀 Starting data fetch from %s: %s", source, ', '.join(indicators))
     def data_fetch_success(self, source: str, indicator: str, value: Optional[float]):
         """Log successful data fetch."""
         if value is not None:
-            self.info(f"✅ {source} | {indicator}: {value}")
+            self._info("✅ %s | %s: %s", source, indicator, value)
         else:
-            self.warning(f"⚠️ {source} | {indicator}: No data returned")
+            self._warning("⚠️ %s | %s: No data returned", source, indicator)
     def data_fetch_error(self, source: str, indicator: str, error: str):
         """Log data fetch error."""
-        self.error(f"❌ {source} | {indicator}: {error}")
+        self._error("❌ %s | %s: %s", source, indicator, error)
     def visualization_start(self, viz_name: str):
         """Log start of visualization generation."""
-        self.info(f"📊 Generating visualization: {viz_name}")
+        self._info("📊 Generating visualization: %s", viz_name)
     def visualization_complete(self, viz_name: str, output_file: str):
         """Log completion of visualization."""
-        self.info(f"✅ Visualization complete: {viz_name} → {output_file}")
+        self._info("✅ Visualization complete: %s → %s", viz_name, output_file)
     def analysis_insight(self, insight: str, value: Optional[float] = None):
         """Log analysis insight."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if value is not None:
-            self.info(f"💡 {insight}: {value}")
+            self._info("💡 %s: %s", insight, value)
         else:
-            self.info(f"💡 {insight}")
+            self._info("💡 %s", insight)
     def performance_metric(self, metric: str, value: float, unit: str = ""):
         """Log performance metric."""
-        self.info(f"📈 {metric}: {value:.2f} {unit}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self._info("📈 %s: %.2f %s", metric, value, unit)
     def regime_transition(self, from_regime: str, to_regime: str, date: str):
         """Log regime transition."""
-        self.info(f"🎭 Regime transition: {from_regime} → {to_regime} on {date}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self._info("🎭 Regime transition: %s → %s on %s", from_regime, to_regime, date)
     def correlation_insight(self, var1: str, var2: str, correlation: float):
         """Log correlation insight."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         strength = "Strong" if abs(correlation) > 0.7 else "Moderate" if abs(correlation) > 0.4 else "Weak"
         direction = "positive" if correlation > 0 else "negative"
-        self.info(f"🔗 {var1} ↔ {var2}: {correlation:.3f} ({strength} {direction})")
+        self._info("🔗 %s ↔ %s: %.3f (%s %s)", var1, var2, correlation, strength, direction)
     def economic_summary(self, period: str, key_metrics: dict):
         """Log economic period summary."""
-        self.info(f"📊 Economic Summary - {period}:")
-        for metric, value in key_metrics.items():
-            self.info(f"   • {metric}: {value}")
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        lines = "".join(f"\n   • {metric}: {value}" for metric, value in key_metrics.items())
+        self._info("📊 Economic Summary - %s:%s", period, lines)
 logger = EconomicAnalysisLogger()
\ No newline at end of file
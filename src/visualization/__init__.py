@@ -1,3 +1,8 @@
 """Visualization module."""
-from .components import VisualizationComponents, viz_components
-__all__ = ['VisualizationComponents', 'viz_components']
\ No newline at end of file
+from .components import VisualizationComponents, get_viz_components
+__all__ = ['VisualizationComponents', 'get_viz_components', 'viz_components']
+def __getattr__(name: str):
+    """Resolve viz_components lazily so importing the package does not build it."""
+    if name == 'viz_components':
+        return get_viz_components()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
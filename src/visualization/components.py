@@ -1,4 +1,9 @@
 """Reusable visualization components for economic analysis."""
+import functools
+import os
+import matplotlib
+if os.environ.get('M2_INTERACTIVE') != '1':
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -6,13 +11,43 @@ import seaborn as sns
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime
 import matplotlib.dates as mdates
-from ..config import config
+from matplotlib.collections import PolyCollection
+from numpy.lib.stride_tricks import sliding_window_view
+from ..analysis.economic_insights import pearson_matrix
+from ..config import get_config
 from ..utils.logger import logger
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+MAX_PLOT_POINTS = 4000
+def _plot_rows(n: int, max_points: int = MAX_PLOT_POINTS):
+    """Positions of at most max_points evenly spaced rows out of n, keeping the first and last."""
+    if n <= max_points:
+        return slice(None)
+    return np.linspace(0, n - 1, max_points).astype(np.intp)
+def _downsample(data, max_points: int = MAX_PLOT_POINTS):
+    """At most max_points evenly spaced rows of a Series or DataFrame, keeping the first and last."""
+    return data.iloc[_plot_rows(len(data), max_points)]
+def _view(df: pd.DataFrame, column: str) -> Tuple[pd.Index, np.ndarray]:
+    """Index and float values of df[column] without its NaN rows, copying nothing when there are none."""
+    values = df[column].to_numpy(dtype=np.float64)
+    missing = np.isnan(values)
+    if missing.any():
+        return df.index[~missing], values[~missing]
+    return df.index, values
+def _rolling_std(values: np.ndarray, window: int) -> np.ndarray:
+    """Sample standard deviation of each full window of values, with bottleneck when it is installed."""
+    if len(values) < window:
+        return np.empty(0)
+    if bn is not None:
+        return bn.move_std(values, window, min_count=window, ddof=1)[window - 1:]
+    return sliding_window_view(values, window).std(axis=1, ddof=1)
 class VisualizationComponents:
     """Reusable components for creating economic visualizations."""
     def __init__(self):
         """Initialize visualization components with configuration."""
-        self.viz_config = config.visualization_settings
+        self.viz_config = get_config().visualization_settings
         plt.style.use(self.viz_config['style'])
         plt.rcParams['figure.dpi'] = self.viz_config['figure_dpi']
         plt.rcParams['figure.facecolor'] = self.viz_config['colors']['background']
@@ -28,17 +63,21 @@ class VisualizationComponents:
         """Create stacked area chart for cumulative variables."""
         if ax is None:
             fig, ax = plt.subplots(figsize=(12, 8))
+        indicator_configs = {var: get_config().get_indicator_config(var) for var in variables
+                             if colors is None or var in df.columns}
         if colors is None:
-            colors = [config.get_indicator_config(var).get('color', '
+            colors = [indicator_configs[var].get('color', '
                      for var in variables]
-        bottom = np.zeros(len(df))
-        for i, (var, color) in enumerate(zip(variables, colors)):
-            if var in df.columns:
-                values = df[var].fillna(0).values
-                ax.fill_between(df.index, bottom, bottom + values, 
-                              alpha=0.7, color=color, 
-                              label=config.get_indicator_config(var)['name'])
-                bottom += values
+        present = [(var, color) for var, color in zip(variables, colors) if var in df.columns]
+        frame = _downsample(df[[var for var, _ in present]])
+        stack = frame.fillna(0.0).to_numpy(dtype=np.float32).T
+        upper = np.cumsum(stack, axis=0)
+        lower = np.zeros_like(upper)
+        lower[1:] = upper[:-1]
+        for i, (var, color) in enumerate(present):
+            ax.fill_between(frame.index, lower[i], upper[i],
+                          alpha=0.7, color=color,
+                          label=indicator_configs[var]['name'])
         ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
         ax.set_ylabel(ylabel, fontsize=12, fontweight='bold')
         ax.legend(loc='upper left', framealpha=0.9)
@@ -60,11 +99,12 @@ class VisualizationComponents:
             fig, ax = plt.subplots(figsize=(12, 8))
         for var in variables:
             if var in df.columns:
-                indicator_config = config.get_indicator_config(var)
-                data = df[var].dropna()
-                if normalize and not data.empty:
-                    data = (data / data.iloc[0]) * 100
-                ax.plot(data.index, data.values,
+                indicator_config = get_config().get_indicator_config(var)
+                index, values = _view(df, var)
+                if normalize and len(values):
+                    values = (values / values[0]) * 100
+                rows = _plot_rows(len(values))
+                ax.plot(index[rows], values[rows],
                        label=indicator_config['name'],
                        color=indicator_config.get('color', '
                        linewidth=2, alpha=0.8)
@@ -83,7 +123,7 @@ class VisualizationComponents:
     ) -> plt.Axes:
         """Add economic regime background shading."""
         if regimes is None:
-            regimes = config.economic_regimes
+            regimes = get_config().economic_regimes
         for regime_key, regime_data in regimes.items():
             start = pd.Timestamp(regime_data['start'])
             end = pd.Timestamp(regime_data['end'])
@@ -101,7 +141,7 @@ class VisualizationComponents:
     ) -> Tuple[plt.Figure, plt.Axes]:
         """Create correlation heatmap with economic groupings."""
         fig, ax = plt.subplots(figsize=figsize)
-        correlation_matrix = df.corr()
+        correlation_matrix = pearson_matrix(df)
         mask = None
         if mask_upper:
             mask = np.triu(np.ones_like(correlation_matrix, dtype=bool))
@@ -132,15 +172,16 @@ class VisualizationComponents:
         fig, ax = plt.subplots(figsize=figsize)
         for asset in assets:
             if asset in df.columns:
-                indicator_config = config.get_indicator_config(asset)
-                data = df[asset].dropna()
-                if not data.empty:
-                    normalized = (data / data.iloc[0]) * normalize_start
-                    ax.plot(normalized.index, normalized.values,
+                indicator_config = get_config().get_indicator_config(asset)
+                index, values = _view(df, asset)
+                if len(values):
+                    rows = _plot_rows(len(values))
+                    index, normalized = index[rows], (values[rows] / values[0]) * normalize_start
+                    ax.plot(index, normalized,
                            label=indicator_config['name'],
                            color=indicator_config.get('color', '
                            linewidth=2.5, alpha=0.9)
-                    ax.fill_between(normalized.index, normalize_start, normalized.values,
+                    ax.fill_between(index, normalize_start, normalized,
                                    alpha=0.15, color=indicator_config.get('color', '
         ax.axhline(y=normalize_start, color='black', linestyle='--', alpha=0.7, linewidth=1)
         ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
@@ -161,14 +202,16 @@ class VisualizationComponents:
     ) -> Tuple[plt.Figure, plt.Axes]:
         """Create volatility analysis chart."""
         fig, ax = plt.subplots(figsize=figsize)
+        indicator_config = get_config().get_indicator_config(asset)
         if title is None:
-            title = f"{config.get_indicator_config(asset)['name']} Volatility Analysis"
+            title = f"{indicator_config['name']} Volatility Analysis"
         if asset in df.columns:
             returns = df[asset].pct_change().dropna()
-            volatility = returns.rolling(window=window).std() * np.sqrt(252) * 100
-            indicator_config = config.get_indicator_config(asset)
+            volatility = pd.Series(_rolling_std(returns.to_numpy(dtype=np.float64), window) * np.sqrt(252) * 100,
+                                   index=returns.index[window - 1:])
             color = indicator_config.get('color', '
-            ax.plot(volatility.index, volatility.values, 
+            shown = _downsample(volatility)
+            ax.plot(shown.index, shown.values, 
                    color=color, linewidth=2, alpha=0.8,
                    label=f'{window}-Day Rolling Volatility')
             mean_vol = volatility.mean()
@@ -193,24 +236,30 @@ class VisualizationComponents:
         if thresholds is None:
             thresholds = {'low': 15, 'medium': 25, 'high': 35}
         if risk_var in df.columns:
-            data = df[risk_var].dropna()
-            low_risk = data <= thresholds['low']
-            medium_risk = (data > thresholds['low']) & (data <= thresholds['medium'])
-            high_risk = data > thresholds['medium']
-            ax.fill_between(data.index, 0, data.values,
-                           where=low_risk, color='green', alpha=0.4, 
-                           label=f'Low Risk (<{thresholds["low"]})')
-            ax.fill_between(data.index, 0, data.values,
-                           where=medium_risk, color='orange', alpha=0.4,
-                           label=f'Medium Risk ({thresholds["low"]}-{thresholds["medium"]})')
-            ax.fill_between(data.index, 0, data.values,
-                           where=high_risk, color='red', alpha=0.4,
-                           label=f'High Risk (>{thresholds["medium"]})')
-            ax.plot(data.index, data.values, color='black', linewidth=2, alpha=0.8)
+            index, values = _view(df, risk_var)
+            rows = _plot_rows(len(values))
+            index, values = index[rows], values[rows]
+            bands = {
+                'green': f'Low Risk (<{thresholds["low"]})',
+                'orange': f'Medium Risk ({thresholds["low"]}-{thresholds["medium"]})',
+                'red': f'High Risk (>{thresholds["medium"]})'
+            }
+            if len(values):
+                band = np.digitize(values, [thresholds['low'], thresholds['medium']], right=True)
+                x = mdates.date2num(index.values)
+                starts = np.flatnonzero(np.r_[True, band[1:] != band[:-1]])
+                ends = np.r_[starts[1:], len(values)]
+                verts = [np.column_stack([np.r_[x[s:e], x[s:e][::-1]], np.r_[values[s:e], np.zeros(e - s)]])
+                         for s, e in zip(starts, ends)]
+                facecolors = np.array(list(bands))[band[starts]]
+                ax.add_collection(PolyCollection(verts, facecolors=facecolors, alpha=0.4, linewidths=0))
+            for color, label in bands.items():
+                ax.fill_between([], [], color=color, alpha=0.4, label=label)
+            ax.plot(index, values, color='black', linewidth=2, alpha=0.8)
             for level, value in thresholds.items():
                 ax.axhline(y=value, color='gray', linestyle='--', alpha=0.6)
         ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
-        ax.set_ylabel(config.get_indicator_config(risk_var)['name'], 
+        ax.set_ylabel(get_config().get_indicator_config(risk_var)['name'], 
                      fontsize=12, fontweight='bold')
         ax.legend(framealpha=0.9)
         ax.grid(True, alpha=0.3)
@@ -222,13 +271,21 @@ class VisualizationComponents:
         filename: str, 
         title: Optional[str] = None
     ) -> str:
-        """Save figure with consistent settings."""
+        """Save figure with consistent settings, laying it out once instead of re-rendering for a tight bbox."""
         output_file = f"{filename}.png"
+        fig.tight_layout()
         fig.savefig(output_file, 
                    dpi=self.viz_config['figure_dpi'], 
-                   bbox_inches='tight',
                    facecolor=self.viz_config['colors']['background'])
         if title:
             logger.visualization_complete(title, output_file)
         return output_file
-viz_components = VisualizationComponents()
\ No newline at end of file
+@functools.lru_cache(maxsize=None)
+def get_viz_components() -> VisualizationComponents:
+    """Return the shared VisualizationComponents, applying the plot style on first use."""
+    return VisualizationComponents()
+def __getattr__(name: str) -> Any:
+    """Build the module-level viz_components singleton lazily on first access."""
+    if name == 'viz_components':
+        return get_viz_components()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""Tests for configuration module."""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from config import Config
+class TestConfig:
+    """Test suite for Config class."""
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.config = Config()
+    def test_get_indicator_config_returns_copy(self):
+        """Test that mutating an indicator's config does not leak into later lookups."""
+        indicator_config = self.config.get_indicator_config('M2SL')
+        indicator_config['source'] = 'mutated'
+        indicator_config.setdefault('extra', 1)
+        assert self.config.get_indicator_config('M2SL')['source'] == 'fred'
+        assert 'extra' not in self.config.get_indicator_config('M2SL')
+    def test_get_all_indicators_returns_copy(self):
+        """Test that mutating the indicator list does not leak into later calls."""
+        indicators = self.config.get_all_indicators()
+        expected = list(indicators)
+        indicators.append('EXTRA')
+        assert self.config.get_all_indicators() == expected
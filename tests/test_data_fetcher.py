@@ -17,35 +17,36 @@ class TestDataFetcher:
         """Test DataFetcher initialization."""
         assert self.fetcher.fred_config == config.api_settings['fred']
         assert self.fetcher.yahoo_config == config.api_settings['yahoo']
-    @patch('data.fetcher.pd.read_csv')
-    def test_fetch_fred_current_success(self, mock_read_csv):
+    @patch('data.fetcher.requests.Session.get')
+    def test_fetch_fred_current_success(self, mock_get):
         """Test successful FRED data fetch."""
-        mock_df = pd.DataFrame({
-            'DATE': ['2023-01-01', '2023-01-02'],
-            'M2SL': [20000.0, 20100.0]
-        })
-        mock_read_csv.return_value = mock_df
+        mock_response = Mock()
+        mock_response.content = b"DATE,M2SL\n2023-01-01,20000.0\n2023-01-02,20100.0"
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
         result = self.fetcher.fetch_fred_current('M2SL')
         assert result == 20100.0
-        mock_read_csv.assert_called_once()
-    @patch('data.fetcher.pd.read_csv')
-    def test_fetch_fred_current_failure(self, mock_read_csv):
+        mock_get.assert_called_once()
+    @patch('data.fetcher.requests.Session.get')
+    def test_fetch_fred_current_failure(self, mock_get):
         """Test FRED data fetch failure."""
-        mock_read_csv.side_effect = Exception("Connection error")
+        mock_get.side_effect = Exception("Connection error")
         result = self.fetcher.fetch_fred_current('M2SL')
         assert result is None
-    @patch('data.fetcher.pd.read_csv')
-    def test_fetch_fred_current_empty_data(self, mock_read_csv):
+    @patch('data.fetcher.requests.Session.get')
+    def test_fetch_fred_current_empty_data(self, mock_get):
         """Test FRED fetch with empty data."""
-        mock_df = pd.DataFrame()
-        mock_read_csv.return_value = mock_df
+        mock_response = Mock()
+        mock_response.content = b""
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
         result = self.fetcher.fetch_fred_current('M2SL')
         assert result is None
-    @patch('data.fetcher.requests.get')
+    @patch('data.fetcher.requests.Session.get')
     def test_fetch_fred_history_success(self, mock_get):
         """Test successful FRED history fetch."""
         mock_response = Mock()
-        mock_response.text = "DATE,M2SL\\n2023-01-01,20000.0\\n2023-01-02,20100.0"
+        mock_response.content = b"DATE,M2SL\n2023-01-01,20000.0\n2023-01-02,20100.0"
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
         start_date = date(2023, 1, 1)
@@ -65,7 +66,7 @@ class TestDataFetcher:
         result = self.fetcher.fetch_yahoo_current(['AAPL'])
         assert result == 105.0
     @patch('data.fetcher.yf.Ticker')
-    @patch('data.fetcher.requests.get')
+    @patch('data.fetcher.requests.Session.get')
     def test_fetch_yahoo_current_fallback(self, mock_requests, mock_ticker_class):
         """Test Yahoo Finance fallback API."""
         mock_ticker = Mock()
@@ -81,6 +82,29 @@ class TestDataFetcher:
         mock_requests.return_value = mock_response
         result = self.fetcher.fetch_yahoo_current(['AAPL'])
         assert result == 110.0
+    @patch('data.fetcher.yf.download')
+    def test_fetch_yahoo_batch(self, mock_download):
+        """Test batched Yahoo Finance download."""
+        columns = pd.MultiIndex.from_product([['AAPL', 'MSFT'], ['Open', 'Close']])
+        mock_download.return_value = pd.DataFrame(
+            [[1.0, 100.0, 2.0, None], [1.0, 105.0, 2.0, None]], columns=columns
+        )
+        result = self.fetcher.fetch_yahoo_batch(['AAPL', 'MSFT'])
+        assert result == {'AAPL': 105.0}
+        mock_download.assert_called_once()
+    @patch('data.fetcher.yf.download')
+    def test_fetch_yahoo_history_batch(self, mock_download):
+        """Test batched Yahoo Finance history download."""
+        columns = pd.MultiIndex.from_product([['AAPL', 'MSFT'], ['Open', 'Close']])
+        mock_download.return_value = pd.DataFrame(
+            [[1.0, 100.0, 2.0, None], [1.0, 105.0, 2.0, None]], columns=columns,
+            index=pd.date_range('2023-01-01', periods=2, freq='D')
+        )
+        with patch.dict(self.fetcher.yahoo_config, {'cache_dir': None}):
+            result = self.fetcher.fetch_yahoo_history_batch(['AAPL', 'MSFT'])
+        assert list(result) == ['AAPL']
+        assert result['AAPL'].tolist() == [100.0, 105.0]
+        mock_download.assert_called_once()
     @patch('data.fetcher.yf.Ticker')
     def test_fetch_yahoo_history_success(self, mock_ticker_class):
         """Test successful Yahoo Finance history fetch."""
@@ -90,12 +114,27 @@ class TestDataFetcher:
         }, index=pd.date_range('2023-01-01', periods=3, freq='D'))
         mock_ticker.history.return_value = mock_history
         mock_ticker_class.return_value = mock_ticker
-        result = self.fetcher.fetch_yahoo_history(['AAPL'])
+        with patch.dict(self.fetcher.yahoo_config, {'cache_dir': None}):
+            result = self.fetcher.fetch_yahoo_history(['AAPL'])
         assert isinstance(result, pd.Series)
         assert len(result) == 3
+    @patch('data.fetcher.yf.Ticker')
+    def test_fetch_yahoo_history_cached(self, mock_ticker_class, tmp_path):
+        """Test that a history downloaded today is read back from the cache."""
+        mock_ticker = Mock()
+        mock_ticker.history.return_value = pd.DataFrame({
+            'Close': [100.0, 105.0, 110.0]
+        }, index=pd.date_range('2023-01-01', periods=3, freq='D'))
+        mock_ticker_class.return_value = mock_ticker
+        with patch.dict(self.fetcher.yahoo_config, {'cache_dir': str(tmp_path)}):
+            first = self.fetcher.fetch_yahoo_history(['AAPL'])
+            second = self.fetcher.fetch_yahoo_history(['AAPL'])
+        assert mock_ticker_class.call_count == 1
+        assert second.tolist() == first.tolist()
     @patch.object(DataFetcher, 'fetch_fred_current')
     @patch.object(DataFetcher, 'fetch_yahoo_current')
-    def test_fetch_all_current(self, mock_yahoo, mock_fred):
+    @patch.object(DataFetcher, 'fetch_yahoo_batch', return_value={})
+    def test_fetch_all_current(self, mock_batch, mock_yahoo, mock_fred):
         """Test fetching all current indicators."""
         mock_fred.return_value = 20000.0
         mock_yahoo.return_value = 100.0
@@ -113,7 +152,8 @@ class TestDataFetcher:
             'BTCUSD': 45000.0
         }
         with patch.object(self.fetcher, 'fetch_fred_current', return_value=None), \
-             patch.object(self.fetcher, 'fetch_yahoo_current', return_value=None):
+             patch.object(self.fetcher, 'fetch_yahoo_current', return_value=None), \
+             patch.object(self.fetcher, 'fetch_yahoo_batch', return_value={}):
             result = self.fetcher.fetch_all_current(fallback_data)
             assert result['M2SL'] == 19500.0
             assert result['BTCUSD'] == 45000.0
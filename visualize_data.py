@@ -1,26 +1,34 @@
-import yaml
+import os
 import pandas as pd
+import matplotlib
+INTERACTIVE = os.environ.get('M2_INTERACTIVE') == '1'
+if not INTERACTIVE:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 import numpy as np
 import seaborn as sns
 from datetime import datetime, timedelta
-from scipy import stats
+from data_loader import load_data, downcast_float32
 import warnings
 warnings.filterwarnings('ignore')
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
-def load_data():
-    """Load and preprocess the data from data.yml"""
-    with open('data.yml', 'r') as f:
-        data = yaml.safe_load(f)
-    df = pd.DataFrame(data)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df.set_index('timestamp', inplace=True)
-    df.sort_index(inplace=True)
-    df = df.dropna(how='all')
-    return df
+_STYLE_APPLIED = False
+def _apply_style():
+    """Apply the whitegrid style and husl palette once, before the first figure is drawn"""
+    global _STYLE_APPLIED
+    if not _STYLE_APPLIED:
+        plt.style.use('seaborn-v0_8-whitegrid')
+        sns.set_palette("husl")
+        _STYLE_APPLIED = True
+def finish_figure(fig):
+    """Show the figure when M2_INTERACTIVE=1, otherwise release its buffers"""
+    if INTERACTIVE:
+        plt.show()
+    else:
+        plt.close(fig)
 def create_time_series_overview(df):
     """Create comprehensive time series overview"""
+    _apply_style()
     fig, axes = plt.subplots(4, 3, figsize=(20, 16))
     fig.suptitle('Economic & Financial Indicators Overview (2020-2025)', fontsize=20, fontweight='bold')
     plots = [
@@ -36,13 +44,17 @@ def create_time_series_overview(df):
         ('BTCUSD', 'Bitcoin Price', 'Price (USD)', 'gold'),
         ('GOLD', 'Gold Price', 'Price (USD)', 'darkgoldenrod')
     ]
+    dates = mdates.date2num(df.index.values)
     for i, (col, title, ylabel, color) in enumerate(plots):
         row, col_idx = i // 3, i % 3
         ax = axes[row, col_idx]
         if col in df.columns:
-            series = df[col].dropna()
-            ax.plot(series.index, series.values, color=color, linewidth=2, alpha=0.8)
-            ax.fill_between(series.index, series.values, alpha=0.3, color=color)
+            values = df[col].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(values)
+            x, y = dates[valid], values[valid]
+            ax.plot(x, y, color=color, linewidth=2, alpha=0.8)
+            ax.fill_between(x, y, alpha=0.3, color=color)
+            ax.xaxis_date()
             ax.set_title(title, fontsize=12, fontweight='bold')
             ax.set_ylabel(ylabel, fontsize=10)
             ax.tick_params(axis='x', rotation=45, labelsize=8)
@@ -50,26 +62,24 @@ def create_time_series_overview(df):
             ax.grid(True, alpha=0.3)
     if len(plots) < 12:
         axes[3, 2].remove()
-    plt.tight_layout()
-    plt.savefig('economic_indicators_overview.png', dpi=300, bbox_inches='tight')
-    plt.show()
-def create_correlation_analysis(df):
+    fig.tight_layout()
+    fig.savefig('economic_indicators_overview.png', dpi=300, bbox_inches='tight')
+    finish_figure(fig)
+def ranked_correlation_pairs(correlation_matrix):
+    """Every (var1, var2, corr) pair above the diagonal, strongest absolute correlation first"""
+    rows, cols = np.triu_indices(len(correlation_matrix.columns), k=1)
+    values = correlation_matrix.to_numpy()[rows, cols]
+    order = np.argsort(-np.abs(values), kind='stable')
+    names = correlation_matrix.columns
+    return [(names[rows[k]], names[cols[k]], values[k]) for k in order]
+def create_correlation_analysis(df, correlation_matrix, corr_pairs):
     """Create correlation heatmap and analysis"""
+    _apply_style()
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(20, 8))
-    correlation_matrix = df.corr()
     mask = np.triu(np.ones_like(correlation_matrix, dtype=bool))
     sns.heatmap(correlation_matrix, mask=mask, annot=True, cmap='RdYlBu_r', center=0,
                 square=True, ax=ax1, fmt='.2f', cbar_kws={'shrink': 0.5})
     ax1.set_title('Correlation Matrix of Economic Indicators', fontsize=14, fontweight='bold')
-    corr_pairs = []
-    for i in range(len(correlation_matrix.columns)):
-        for j in range(i+1, len(correlation_matrix.columns)):
-            corr_pairs.append((
-                correlation_matrix.columns[i],
-                correlation_matrix.columns[j], 
-                correlation_matrix.iloc[i, j]
-            ))
-    corr_pairs.sort(key=lambda x: abs(x[2]), reverse=True)
     top_10 = corr_pairs[:10]
     labels = [f"{pair[0]}-{pair[1]}" for pair in top_10]
     values = [pair[2] for pair in top_10]
@@ -83,74 +93,74 @@ def create_correlation_analysis(df):
     for i, (bar, val) in enumerate(zip(bars, values)):
         ax2.text(val + (0.01 if val > 0 else -0.01), i, f'{val:.3f}', 
                 va='center', ha='left' if val > 0 else 'right', fontsize=9)
-    plt.tight_layout()
-    plt.savefig('correlation_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    fig.savefig('correlation_analysis.png', dpi=300, bbox_inches='tight')
+    finish_figure(fig)
+def paired_values(df, x, y):
+    """Values of columns x and y on the rows where both are present"""
+    pair = df[[x, y]].dropna().to_numpy(dtype=np.float64)
+    return pair[:, 0], pair[:, 1]
 def create_economic_relationships(df):
     """Analyze key economic relationships"""
+    _apply_style()
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
     fig.suptitle('Key Economic Relationships', fontsize=16, fontweight='bold')
     ax1 = axes[0, 0]
     if 'M2SL' in df.columns and 'PCEPILFE' in df.columns:
-        ax1.scatter(df['M2SL'], df['PCEPILFE'], alpha=0.6, color='blue', s=20)
-        z = np.polyfit(df['M2SL'].dropna(), df['PCEPILFE'].dropna(), 1)
-        p = np.poly1d(z)
-        ax1.plot(df['M2SL'].dropna(), p(df['M2SL'].dropna()), "r--", alpha=0.8)
+        x, y = paired_values(df, 'M2SL', 'PCEPILFE')
+        ax1.scatter(x, y, alpha=0.6, color='blue', s=20)
+        slope, intercept = np.polyfit(x, y, 1)
+        ends = np.array([x.min(), x.max()])
+        ax1.plot(ends, slope * ends + intercept, "r--", alpha=0.8)
         ax1.set_xlabel('Money Supply M2')
         ax1.set_ylabel('Core PCE Price Index')
         ax1.set_title('Money Supply vs Inflation')
     ax2 = axes[0, 1]
     if 'TNX' in df.columns and 'BAMLH0A0HYM2' in df.columns:
-        ax2.scatter(df['TNX'], df['BAMLH0A0HYM2'], alpha=0.6, color='green', s=20)
-        z = np.polyfit(df['TNX'].dropna(), df['BAMLH0A0HYM2'].dropna(), 1)
-        p = np.poly1d(z)
-        ax2.plot(df['TNX'].dropna(), p(df['TNX'].dropna()), "r--", alpha=0.8)
+        x, y = paired_values(df, 'TNX', 'BAMLH0A0HYM2')
+        ax2.scatter(x, y, alpha=0.6, color='green', s=20)
+        slope, intercept = np.polyfit(x, y, 1)
+        ends = np.array([x.min(), x.max()])
+        ax2.plot(ends, slope * ends + intercept, "r--", alpha=0.8)
         ax2.set_xlabel('10-Year Treasury Yield')
         ax2.set_ylabel('High Yield Spread')
         ax2.set_title('Risk-Free Rate vs Credit Spread')
     ax3 = axes[1, 0]
     if 'VIX' in df.columns and 'NDX' in df.columns:
-        ax3.scatter(df['VIX'], df['NDX'], alpha=0.6, color='red', s=20)
-        z = np.polyfit(df['VIX'].dropna(), df['NDX'].dropna(), 1)
-        p = np.poly1d(z)
-        ax3.plot(df['VIX'].dropna(), p(df['VIX'].dropna()), "r--", alpha=0.8)
+        x, y = paired_values(df, 'VIX', 'NDX')
+        ax3.scatter(x, y, alpha=0.6, color='red', s=20)
+        slope, intercept = np.polyfit(x, y, 1)
+        ends = np.array([x.min(), x.max()])
+        ax3.plot(ends, slope * ends + intercept, "r--", alpha=0.8)
         ax3.set_xlabel('VIX (Volatility)')
         ax3.set_ylabel('NASDAQ 100 Index')
         ax3.set_title('Market Volatility vs Stock Prices')
     ax4 = axes[1, 1]
     if 'DXY' in df.columns and 'GOLD' in df.columns:
-        ax4.scatter(df['DXY'], df['GOLD'], alpha=0.6, color='gold', s=20)
-        z = np.polyfit(df['DXY'].dropna(), df['GOLD'].dropna(), 1)
-        p = np.poly1d(z)
-        ax4.plot(df['DXY'].dropna(), p(df['DXY'].dropna()), "r--", alpha=0.8)
+        x, y = paired_values(df, 'DXY', 'GOLD')
+        ax4.scatter(x, y, alpha=0.6, color='gold', s=20)
+        slope, intercept = np.polyfit(x, y, 1)
+        ends = np.array([x.min(), x.max()])
+        ax4.plot(ends, slope * ends + intercept, "r--", alpha=0.8)
         ax4.set_xlabel('US Dollar Index')
         ax4.set_ylabel('Gold Price')
         ax4.set_title('Dollar Strength vs Gold Price')
-    plt.tight_layout()
-    plt.savefig('economic_relationships.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    fig.savefig('economic_relationships.png', dpi=300, bbox_inches='tight')
+    finish_figure(fig)
 def create_performance_dashboard(df):
     """Create performance dashboard with key metrics"""
+    _apply_style()
     fig = plt.figure(figsize=(20, 12))
     gs = fig.add_gridspec(3, 4, hspace=0.3, wspace=0.3)
-    recent_30d = df.tail(30)
-    previous_30d = df.iloc[-60:-30]
     ax_summary = fig.add_subplot(gs[0, :])
     ax_summary.axis('off')
-    metrics = {}
-    for col in df.columns:
-        if col in recent_30d.columns and col in previous_30d.columns:
-            recent_avg = recent_30d[col].mean()
-            previous_avg = previous_30d[col].mean() 
-            if not pd.isna(recent_avg) and not pd.isna(previous_avg) and previous_avg != 0:
-                pct_change = ((recent_avg - previous_avg) / previous_avg) * 100
-                metrics[col] = pct_change
-    summary_text = "Performance Summary (Last 30 Days vs Previous 30 Days):\\n\\n"
-    for i, (indicator, change) in enumerate(metrics.items()):
-        color = "🔴" if change < 0 else "🟢"
-        summary_text += f"{color} {indicator}: {change:+.2f}%    "
-        if i % 4 == 3:
-            summary_text += "\\n"
+    recent_avg = df.tail(30).mean()
+    previous_avg = df.iloc[-60:-30].mean()
+    metrics = ((recent_avg - previous_avg) / previous_avg.replace(0, np.nan) * 100).dropna()
+    cells = [f"{'🔴' if change < 0 else '🟢'} {indicator}: {change:+.2f}%    " + ("\\n" if i % 4 == 3 else "")
+             for i, (indicator, change) in enumerate(metrics.items())]
+    summary_text = "Performance Summary (Last 30 Days vs Previous 30 Days):\\n\\n" + "".join(cells)
     ax_summary.text(0.05, 0.5, summary_text, transform=ax_summary.transAxes, 
                    fontsize=12, verticalalignment='center', fontfamily='monospace')
     indicators = ['M2SL', 'BTCUSD', 'GOLD', 'VIX', 'TNX', 'NDX']
@@ -165,18 +175,23 @@ def create_performance_dashboard(df):
             ax.set_title(f'{indicator} - Last 90 Days', fontweight='bold')
             ax.tick_params(axis='x', rotation=45, labelsize=8)
             ax.grid(True, alpha=0.3)
-    plt.suptitle('Economic Indicators Performance Dashboard', fontsize=18, fontweight='bold')
-    plt.savefig('performance_dashboard.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.suptitle('Economic Indicators Performance Dashboard', fontsize=18, fontweight='bold')
+    fig.savefig('performance_dashboard.png', dpi=300, bbox_inches='tight')
+    finish_figure(fig)
 def create_volatility_analysis(df):
     """Analyze volatility patterns"""
+    _apply_style()
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
     fig.suptitle('Volatility Analysis', fontsize=16, fontweight='bold')
     rolling_window = 30
+    vol_assets = [asset for asset in ['NDX', 'BTCUSD', 'GOLD', 'DXY'] if asset in df.columns]
+    prices = df[vol_assets].to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = pd.DataFrame(np.diff(prices, axis=0) / prices[:-1], index=df.index[1:], columns=vol_assets)
+    vol_data = returns.rolling(window=rolling_window).std() * np.sqrt(252) * 100
     ax1 = axes[0, 0]
     if 'VIX' in df.columns and 'NDX' in df.columns:
-        ndx_returns = df['NDX'].pct_change().dropna()
-        ndx_volatility = ndx_returns.rolling(window=rolling_window).std() * np.sqrt(252) * 100
+        ndx_volatility = vol_data['NDX']
         vix_aligned = df['VIX'].reindex(ndx_volatility.index)
         ax1.scatter(vix_aligned, ndx_volatility, alpha=0.6, s=20)
         ax1.set_xlabel('VIX')
@@ -185,8 +200,7 @@ def create_volatility_analysis(df):
         ax1.grid(True, alpha=0.3)
     ax2 = axes[0, 1]
     if 'BTCUSD' in df.columns:
-        btc_returns = df['BTCUSD'].pct_change().dropna()
-        btc_volatility = btc_returns.rolling(window=rolling_window).std() * np.sqrt(252) * 100
+        btc_volatility = vol_data['BTCUSD']
         ax2.plot(btc_volatility.index, btc_volatility.values, color='orange', linewidth=2)
         ax2.set_ylabel('Annualized Volatility (%)')
         ax2.set_title('Bitcoin 30-Day Rolling Volatility')
@@ -200,22 +214,16 @@ def create_volatility_analysis(df):
         ax3.set_title('10-Year Treasury Volatility')
         ax3.grid(True, alpha=0.3)
     ax4 = axes[1, 1]
-    vol_data = {}
-    for asset in ['NDX', 'BTCUSD', 'GOLD', 'DXY']:
-        if asset in df.columns:
-            returns = df[asset].pct_change().dropna()
-            volatility = returns.rolling(window=rolling_window).std() * np.sqrt(252) * 100
-            vol_data[asset] = volatility
     for asset, vol in vol_data.items():
         ax4.plot(vol.index, vol.values, label=asset, linewidth=2, alpha=0.8)
     ax4.set_ylabel('Annualized Volatility (%)')
     ax4.set_title('Cross-Asset Volatility Comparison')
     ax4.legend()
     ax4.grid(True, alpha=0.3)
-    plt.tight_layout()
-    plt.savefig('volatility_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
-def generate_insights(df):
+    fig.tight_layout()
+    fig.savefig('volatility_analysis.png', dpi=300, bbox_inches='tight')
+    finish_figure(fig)
+def generate_insights(df, corr_pairs):
     """Generate key insights from the data"""
     print("\\n" + "="*80)
     print("KEY INSIGHTS FROM ECONOMIC DATA ANALYSIS")
@@ -236,24 +244,14 @@ def generate_insights(df):
                 emoji = "🔴" if pct_change < 0 else "🟢"
                 print(f"   {emoji} {col}: {pct_change:+.2f}%")
     print(f"\\n⚡ NOTABLE EXTREMES:")
-    for col in ['VIX', 'BTCUSD', 'TNX']:
-        if col in df.columns:
-            max_val = df[col].max()
-            min_val = df[col].min()
-            max_date = df[col].idxmax().strftime('%Y-%m-%d')
-            min_date = df[col].idxmin().strftime('%Y-%m-%d')
-            print(f"   • {col}: Max {max_val:.2f} on {max_date}, Min {min_val:.2f} on {min_date}")
+    extreme_cols = [col for col in ['VIX', 'BTCUSD', 'TNX'] if col in df.columns and df[col].notna().any()]
+    values = df[extreme_cols].to_numpy()
+    max_rows = np.nanargmax(values, axis=0) if extreme_cols else []
+    min_rows = np.nanargmin(values, axis=0) if extreme_cols else []
+    for j, (col, max_row, min_row) in enumerate(zip(extreme_cols, max_rows, min_rows)):
+        print(f"   • {col}: Max {values[max_row, j]:.2f} on {df.index[max_row]:%Y-%m-%d}, "
+              f"Min {values[min_row, j]:.2f} on {df.index[min_row]:%Y-%m-%d}")
     print(f"\\n🔗 STRONGEST CORRELATIONS:")
-    corr_matrix = df.corr()
-    corr_pairs = []
-    for i in range(len(corr_matrix.columns)):
-        for j in range(i+1, len(corr_matrix.columns)):
-            corr_pairs.append((
-                corr_matrix.columns[i],
-                corr_matrix.columns[j],
-                corr_matrix.iloc[i, j]
-            ))
-    corr_pairs.sort(key=lambda x: abs(x[2]), reverse=True)
     for i, (var1, var2, corr) in enumerate(corr_pairs[:5]):
         relationship = "Strong Positive" if corr > 0.7 else "Strong Negative" if corr < -0.7 else "Moderate"
         print(f"   • {var1} ↔ {var2}: {corr:.3f} ({relationship})")
@@ -261,12 +259,14 @@ def generate_insights(df):
 def main():
     """Main function to run all visualizations"""
     print("🚀 Loading economic data...")
-    df = load_data()
+    df = downcast_float32(load_data())
     print(f"📊 Loaded {len(df)} data points from {df.index.min()} to {df.index.max()}")
     print("\\n📈 Creating visualizations...")
     create_time_series_overview(df)
     print("✅ Time series overview complete")
-    create_correlation_analysis(df)
+    correlation_matrix = df.corr()
+    corr_pairs = ranked_correlation_pairs(correlation_matrix)
+    create_correlation_analysis(df, correlation_matrix, corr_pairs)
     print("✅ Correlation analysis complete")
     create_economic_relationships(df)
     print("✅ Economic relationships complete")
@@ -274,7 +274,7 @@ def main():
     print("✅ Performance dashboard complete")
     create_volatility_analysis(df)
     print("✅ Volatility analysis complete")
-    generate_insights(df)
+    generate_insights(df, corr_pairs)
     print("\\n🎉 All visualizations completed! Check the generated PNG files.")
 if __name__ == "__main__":
     main()